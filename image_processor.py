@@ -19,9 +19,11 @@ import numpy as np
 import os
 import sys
 import argparse
+import concurrent.futures
+import functools
+import multiprocessing
 import subprocess
-import tempfile
-import shutil
+from collections import OrderedDict
 from pathlib import Path
 
 from media_utils import (
@@ -30,11 +32,19 @@ from media_utils import (
     DEFAULT_SCREEN_WIDTH,
     DEFAULT_SCREEN_HEIGHT,
     MIN_CROP_SIZE,
+    PREVIEW_PROXY_MIN_BYTES,
     get_media_files,
+    get_video_properties,
     is_video,
     check_ffmpeg,
     require_ffmpeg,
+    check_cuda_pipeline,
+    detect_hw_encoder,
+    start_preview_proxy,
+    stop_preview_proxy,
     run_ffmpeg_encode,
+    build_blur_pad_filter,
+    build_blur_pad_filter_cuda,
     parse_time_to_seconds,
     format_time_precise,
     process_image_cv,
@@ -61,20 +71,133 @@ class ImageCropper:
         self.rect = None
         self.confirmed = False
         self.skipped = False
+        self._display_buf = np.empty_like(self.original)
+        self._text_layer = self._render_text_layer(
+            "Draw rectangle | ENTER=Confirm | R=Reset | S=Skip | Q=Quit"
+        )
+        self._dirty = True
+        
+        # OpenCL (T-API): with UMat buffers OpenCV runs the redraw on the GPU,
+        # and imshow accepts the UMat directly
+        self._use_umat = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+        if self._use_umat:
+            self._init_umat()
+    
+    def _init_umat(self):
+        """Upload the frame buffers and the darkening table for _render_display_umat."""
+        self._original_umat = cv2.UMat(self.original)
+        self._display_umat = cv2.UMat(self.original)
+        # The same uint8 * factor truncation as _darken_outside, as a table
+        table = np.arange(256, dtype=np.uint8)
+        np.multiply(table, 0.4, out=table, casting='unsafe')
+        self._darken_lut = cv2.UMat(table.reshape(1, 256))
+    
+    def _render_text_layer(self, text):
+        """
+        Render the static instruction text once as a sprite for the top-left corner.
+        
+        The text is drawn over black and over white; the difference gives the
+        per-pixel transparency, so anti-aliased edges blend exactly like putText.
+        Returns (premultiplied color, inverse alpha) as float32 arrays.
+        """
+        h, w = self.original.shape[:2]
+        rows = min(40, h)
+        # Only as wide as the text, so the blit skips the rest of the row
+        (text_w, _), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+        cols = min(w, 10 + text_w + 4)
+        on_black = np.zeros((rows, cols, 3), dtype=np.uint8)
+        on_white = np.full((rows, cols, 3), 255, dtype=np.uint8)
+        for layer in (on_black, on_white):
+            cv2.putText(layer, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            cv2.putText(layer, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 1)
+        inv_alpha = (on_white.astype(np.float32) - on_black) / 255.0
+        # +0.5 so the uint8 cast below rounds instead of truncating
+        return on_black.astype(np.float32) + 0.5, inv_alpha
+    
+    @staticmethod
+    def _outside_bands(w, h, x1, y1, x2, y2):
+        """Return the (top, bottom, left, right) bands around a selection as (y0, y1, x0, x1)."""
+        x1, x2 = max(0, min(x1, w)), max(0, min(x2, w))
+        y1, y2 = max(0, min(y1, h)), max(0, min(y2, h))
+        return [(0, y1, 0, w), (y2, h, 0, w), (y1, y2, 0, x1), (y1, y2, x2, w)]
+    
+    @staticmethod
+    def _darken_outside(buf, x1, y1, x2, y2, factor=0.4):
+        """Darken buf in place everywhere outside (x1, y1)-(x2, y2)."""
+        h, w = buf.shape[:2]
+        # Four bands instead of a full-frame mask
+        for by0, by1, bx0, bx1 in ImageCropper._outside_bands(w, h, x1, y1, x2, y2):
+            band = buf[by0:by1, bx0:bx1]
+            np.multiply(band, factor, out=band, casting='unsafe')
+    
+    def _selection(self):
+        """Return the current selection as (x1, y1, x2, y2), or None."""
+        if not (self.start_point and self.end_point):
+            return None
+        return normalize_rect(
+            self.start_point[0], self.start_point[1],
+            self.end_point[0], self.end_point[1]
+        )
+    
+    def _render_display(self):
+        """Build the display frame in the reused ndarray buffer."""
+        display = self._display_buf
+        np.copyto(display, self.original)
+        
+        # Draw current selection
+        selection = self._selection()
+        if selection is not None:
+            # Darken areas outside selection
+            self._darken_outside(display, *selection)
+            cv2.rectangle(display, self.start_point, self.end_point, (0, 255, 0), 2)
+        
+        # Add instructions overlay
+        text_color, text_inv_alpha = self._text_layer
+        text_region = display[:text_color.shape[0], :text_color.shape[1]]
+        np.copyto(text_region, text_color + text_region * text_inv_alpha, casting='unsafe')
+        return display
+    
+    def _render_display_umat(self):
+        """Build the display frame with OpenCL (UMat) operations."""
+        display = self._display_umat
+        cv2.copyTo(self._original_umat, None, dst=display)
+        
+        selection = self._selection()
+        if selection is not None:
+            h, w = self.original.shape[:2]
+            for by0, by1, bx0, bx1 in self._outside_bands(w, h, *selection):
+                if by1 > by0 and bx1 > bx0:
+                    band = cv2.UMat(display, (by0, by1), (bx0, bx1))
+                    cv2.LUT(band, self._darken_lut, dst=band)
+            cv2.rectangle(display, self.start_point, self.end_point, (0, 255, 0), 2)
+        
+        # The same cached text sprite as _render_display. Its region is a few
+        # rows high, so it is blended on the CPU with the exact same float32
+        # math and written back, keeping both paths pixel-identical
+        text_color, text_inv_alpha = self._text_layer
+        rows, cols = text_color.shape[:2]
+        text_umat = cv2.UMat(display, (0, rows), (0, cols))
+        text_region = text_umat.get()
+        np.copyto(text_region, text_color + text_region * text_inv_alpha, casting='unsafe')
+        cv2.copyTo(cv2.UMat(text_region), None, dst=text_umat)
+        return display
         
     def mouse_callback(self, event, x, y, flags, param):
         if event == cv2.EVENT_LBUTTONDOWN:
             self.drawing = True
             self.start_point = (x, y)
             self.end_point = (x, y)
+            self._dirty = True
             
         elif event == cv2.EVENT_MOUSEMOVE:
             if self.drawing:
                 self.end_point = (x, y)
+                self._dirty = True
                 
         elif event == cv2.EVENT_LBUTTONUP:
             self.drawing = False
             self.end_point = (x, y)
+            self._dirty = True
             if self.start_point and self.end_point:
                 rect = normalize_rect(
                     self.start_point[0], self.start_point[1],
@@ -107,37 +230,16 @@ class ImageCropper:
         print("="*50)
         
         while True:
-            display = self.original.copy()
+            # Only rebuild the frame when the selection changed
+            if self._dirty:
+                if self._use_umat:
+                    display = self._render_display_umat()
+                else:
+                    display = self._render_display()
+                cv2.imshow(self.window_name, display)
+                self._dirty = False
             
-            # Draw current selection
-            if self.start_point and self.end_point:
-                cv2.rectangle(display, self.start_point, self.end_point, (0, 255, 0), 2)
-                
-                # Draw semi-transparent overlay outside selection
-                overlay = display.copy()
-                x1 = min(self.start_point[0], self.end_point[0])
-                y1 = min(self.start_point[1], self.end_point[1])
-                x2 = max(self.start_point[0], self.end_point[0])
-                y2 = max(self.start_point[1], self.end_point[1])
-                
-                # Darken areas outside selection
-                mask = np.zeros(display.shape[:2], dtype=np.uint8)
-                mask[y1:y2, x1:x2] = 255
-                overlay[mask == 0] = (overlay[mask == 0] * 0.4).astype(np.uint8)
-                display = overlay
-                
-                # Redraw rectangle on top
-                cv2.rectangle(display, self.start_point, self.end_point, (0, 255, 0), 2)
-            
-            # Add instructions overlay
-            cv2.putText(display, "Draw rectangle | ENTER=Confirm | R=Reset | S=Skip | Q=Quit", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            cv2.putText(display, "Draw rectangle | ENTER=Confirm | R=Reset | S=Skip | Q=Quit", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 1)
-            
-            cv2.imshow(self.window_name, display)
-            
-            key = cv2.waitKey(1) & 0xFF
+            key = cv2.waitKey(15) & 0xFF
             
             if key == 13:  # Enter key
                 self.confirmed = True
@@ -146,6 +248,7 @@ class ImageCropper:
                 self.start_point = None
                 self.end_point = None
                 self.rect = None
+                self._dirty = True
             elif key == ord('s') or key == ord('S'):
                 self.skipped = True
                 break
@@ -193,6 +296,9 @@ def process_video(video_path, output_path, crop_rect=None, start_time=None, end_
     2. Apply crop if specified
     3. Scale and add blurred background padding
     
+    Trimming, cropping, padding and encoding all happen in a single ffmpeg
+    pass (see build_blur_pad_filter); no frames are decoded in Python.
+    
     Args:
         video_path: Path to input video
         output_path: Path for output video
@@ -207,106 +313,68 @@ def process_video(video_path, output_path, crop_rect=None, start_time=None, end_
         ValueError: If video cannot be opened
         RuntimeError: If ffmpeg is required but not available
     """
-    # Open video
-    cap = cv2.VideoCapture(str(video_path))
-    if not cap.isOpened():
-        raise ValueError(f"Failed to open video: {video_path}")
+    props = get_video_properties(video_path)
+    fps = props['fps']
+    duration = props['duration']
     
-    # Get video properties
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    original_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    original_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    duration = total_frames / fps if fps > 0 else 0
+    print(f"  Video info: {props['width']}x{props['height']}, {fps:.2f}fps, {duration:.2f}s")
     
-    print(f"  Video info: {original_width}x{original_height}, {fps:.2f}fps, {duration:.2f}s")
+    # Calculate time range based on start/end time
+    offset = start_time if start_time else 0
+    clip_duration = (end_time - offset) if end_time else None
     
-    # Calculate frame range based on start/end time
-    start_frame = 0
-    end_frame = total_frames
+    range_end = end_time if end_time else duration
+    print(f"  Processing {format_time_precise(offset)} to {format_time_precise(range_end)}")
     
-    if start_time is not None:
-        start_frame = int(start_time * fps)
-        start_frame = max(0, min(start_frame, total_frames - 1))
-    
-    if end_time is not None:
-        end_frame = int(end_time * fps)
-        end_frame = max(start_frame + 1, min(end_frame, total_frames))
-    
-    frames_to_process = end_frame - start_frame
-    print(f"  Processing frames {start_frame} to {end_frame} ({frames_to_process} frames)")
+    require_ffmpeg()
     
-    # Create temporary file for intermediate output
-    temp_dir = tempfile.mkdtemp()
-    temp_output = os.path.join(temp_dir, 'temp_video.mp4')
-    
-    try:
-        # Setup video writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(temp_output, fourcc, fps, (target_width, target_height))
-        
-        if not out.isOpened():
-            raise RuntimeError("Failed to create video writer")
-        
-        # Seek to start frame
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-        
-        # Process frames
-        processed = 0
-        for frame_idx in range(frames_to_process):
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Apply crop if specified
-            if crop_rect is not None:
-                x1, y1, x2, y2 = crop_rect
-                frame = frame[y1:y2, x1:x2]
-            
-            # Process frame (scale and add blur padding)
-            processed_frame = process_image_cv(
-                frame,
-                target_width=target_width,
-                target_height=target_height,
-                blur_radius=blur_radius
+    def encode(use_cuda, hw_encode=False):
+        if use_cuda:
+            video_filter = build_blur_pad_filter_cuda(
+                props['width'], props['height'], target_width, target_height, blur_radius, crop_rect
             )
-            
-            out.write(processed_frame)
-            processed += 1
-            
-            # Progress indicator
-            if processed % 30 == 0 or processed == frames_to_process:
-                progress = (processed / frames_to_process) * 100
-                print(f"\r  Processing: {progress:.1f}% ({processed}/{frames_to_process} frames)", end='')
-        
-        print()  # New line after progress
-        
-        cap.release()
-        out.release()
-        
-        # Re-encode with ffmpeg (required for proper output)
-        require_ffmpeg()
-        print("  Re-encoding with ffmpeg...")
-        
-        audio_offset = start_time if start_time else 0
-        audio_duration = (end_time - (start_time or 0)) if end_time else None
-        
+        else:
+            video_filter = build_blur_pad_filter(target_width, target_height, blur_radius, crop_rect)
         run_ffmpeg_encode(
-            temp_output,
+            str(video_path),
             str(output_path),
             audio_source=str(video_path),
-            audio_offset=audio_offset,
-            audio_duration=audio_duration,
-            include_audio=True
+            audio_offset=offset,
+            audio_duration=clip_duration,
+            include_audio=True,
+            video_filter=video_filter,
+            input_offset=offset,
+            input_duration=clip_duration,
+            use_cuda=use_cuda,
+            hw_encode=hw_encode
         )
-        
-    finally:
-        shutil.rmtree(temp_dir)
+    
+    if check_cuda_pipeline():
+        print("  Encoding with ffmpeg (CUDA/NVENC)...")
+        try:
+            encode(use_cuda=True)
+            return
+        except subprocess.CalledProcessError:
+            # e.g. unsupported pixel format or NVENC session limit reached
+            print("  GPU encode failed, falling back to CPU")
+    elif detect_hw_encoder():
+        print(f"  Encoding with ffmpeg ({detect_hw_encoder()['video_codec']})...")
+        try:
+            encode(use_cuda=False, hw_encode=True)
+            return
+        except subprocess.CalledProcessError:
+            print("  Hardware encode failed, falling back to CPU")
+    else:
+        print("  Encoding with ffmpeg...")
+    encode(use_cuda=False)
 
 
 class VideoSeeker:
     """Interactive video seeking UI using OpenCV for selecting start/end times."""
     
+    # Files larger than this are scrubbed through a low-res, short-GOP proxy
+    PROXY_MIN_BYTES = PREVIEW_PROXY_MIN_BYTES
+    
     def __init__(self, video_path, window_name="Video Seeker"):
         self.video_path = str(video_path)
         self.cap = cv2.VideoCapture(self.video_path)
@@ -330,60 +398,163 @@ class VideoSeeker:
         # For display scaling
         self.scale = 1.0
         
+        # Recently decoded frames (LRU) and the decoder's current position
+        self._frame_cache = OrderedDict()
+        self._frame_cache_size = 64
+        self._last_read_frame = -1
+        
+        # Reused display buffer and the pre-rendered static parts of the HUD
+        self._display_buf = None
+        self._static_hud = None
+        
+        # Time strings for the HUD, memoized per frame index
+        self._format_frame_time = functools.lru_cache(maxsize=2048)(
+            lambda frame: format_time_precise(self.frame_to_time(frame))
+        )
+        
+        # Proxy encode running in the background (see _start_proxy)
+        self._proxy_proc = None
+        self._proxy_path = None
+        if os.path.getsize(self.video_path) > self.PROXY_MIN_BYTES and check_ffmpeg():
+            self._start_proxy()
+        
+    def _start_proxy(self):
+        """Start encoding a window-sized proxy of the video; get_frame switches to it once ready."""
+        scale = min(DEFAULT_SCREEN_WIDTH / self.width, (DEFAULT_SCREEN_HEIGHT - 100) / self.height, 1.0)
+        self._proxy_proc, self._proxy_path = start_preview_proxy(self.video_path, int(self.width * scale))
+    
+    def _poll_proxy(self):
+        """Switch frame reads to the proxy once its encode has finished."""
+        if self._proxy_proc is None or self._proxy_proc.poll() is None:
+            return
+        succeeded = self._proxy_proc.returncode == 0
+        self._proxy_proc = None
+        if not succeeded:
+            return
+        
+        proxy_cap = cv2.VideoCapture(self._proxy_path)
+        if proxy_cap.isOpened() and int(proxy_cap.get(cv2.CAP_PROP_FRAME_COUNT)) > 0:
+            self.cap.release()
+            self.cap = proxy_cap
+            self._frame_cache.clear()
+            self._last_read_frame = -1
+        else:
+            proxy_cap.release()
+    
+    def _close_proxy(self):
+        """Stop a running proxy encode and delete the proxy file."""
+        stop_preview_proxy(self._proxy_proc, self._proxy_path)
+        self._proxy_proc = None
+        self._proxy_path = None
+    
     def frame_to_time(self, frame):
         """Convert frame number to seconds."""
         return frame / self.fps if self.fps > 0 else 0
     
     def get_frame(self, frame_number):
-        """Get a specific frame from the video."""
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        """Get a specific frame from the video (cached, callers must not modify it)."""
+        self._poll_proxy()
+        frame = self._frame_cache.get(frame_number)
+        if frame is not None:
+            self._frame_cache.move_to_end(frame_number)
+            return frame
+        
+        # Short forward steps keep decoding (grab skips the BGR conversion);
+        # seeking restarts from a keyframe, so only seek for long or backward jumps
+        skip = frame_number - self._last_read_frame - 1
+        if self._last_read_frame >= 0 and 0 <= skip < 50:
+            for _ in range(skip):
+                self.cap.grab()
+        else:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
         ret, frame = self.cap.read()
-        return frame if ret else None
+        if not ret:
+            self._last_read_frame = -1
+            return None
+        self._last_read_frame = frame_number
+        
+        self._frame_cache[frame_number] = frame
+        if len(self._frame_cache) > self._frame_cache_size:
+            self._frame_cache.popitem(last=False)
+        return frame
     
     def on_trackbar(self, val):
         """Trackbar callback for current position."""
         self.current_frame = val
+        self._trackbar_pos = val
     
     def on_start_trackbar(self, val):
         """Trackbar callback for start position."""
         self.start_frame = min(val, self.end_frame - 1)
-        cv2.setTrackbarPos('Start', self.window_name, self.start_frame)
+        if self.start_frame != val:
+            cv2.setTrackbarPos('Start', self.window_name, self.start_frame)
     
     def on_end_trackbar(self, val):
         """Trackbar callback for end position."""
         self.end_frame = max(val, self.start_frame + 1)
-        cv2.setTrackbarPos('End', self.window_name, self.end_frame)
+        if self.end_frame != val:
+            cv2.setTrackbarPos('End', self.window_name, self.end_frame)
+    
+    def _build_static_hud(self, h, w):
+        """
+        Pre-render the darkened text bands and their static text.
+        
+        Each band is drawn over black and over white; the difference gives the
+        per-pixel transparency, so blitting it with draw_ui reproduces the 50%
+        darkening plus the text in a single pass over the band rows.
+        Returns a list of (first_row, premultiplied color, inverse alpha).
+        """
+        def render_band(y0, y1, draw):
+            # 254 keeps the darkened white base exact (127 = 254 * 0.5)
+            layers = []
+            for base in (0, 254):
+                layer = np.full((y1 - y0, w, 3), base // 2, dtype=np.uint8)
+                draw(layer)
+                layers.append(layer.astype(np.float32))
+            on_black, on_white = layers
+            # +0.5 so the uint8 cast in draw_ui rounds instead of truncating
+            return y0, on_black + 0.5, (on_white - on_black) / 254.0
+        
+        def draw_top(layer):
+            cv2.putText(layer, f"Total: {format_time_precise(self.duration)}", 
+                       (10, 75), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        
+        def draw_bottom(layer):
+            cv2.putText(layer, "[  ] = Start/End at current | ENTER = Confirm | S = Skip | Q = Quit", 
+                       (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            cv2.putText(layer, "LEFT/RIGHT = Seek | SHIFT+Arrow = Fine seek | HOME/END = Go to start/end points", 
+                       (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        
+        return [
+            render_band(0, min(81, h), draw_top),
+            render_band(max(0, h - 60), h, draw_bottom),
+        ]
     
     def draw_ui(self, frame):
-        """Draw UI overlay on frame."""
-        display = frame.copy()
+        """Draw UI overlay on frame (into a reused buffer, valid until the next call)."""
+        if self._display_buf is None or self._display_buf.shape != frame.shape:
+            self._display_buf = np.empty_like(frame)
+            self._static_hud = self._build_static_hud(*frame.shape[:2])
+        display = self._display_buf
+        np.copyto(display, frame)
         h, w = display.shape[:2]
         
-        # Draw semi-transparent overlay for text background
-        overlay = display.copy()
-        cv2.rectangle(overlay, (0, 0), (w, 80), (0, 0, 0), -1)
-        cv2.rectangle(overlay, (0, h - 60), (w, h), (0, 0, 0), -1)
-        display = cv2.addWeighted(overlay, 0.5, display, 0.5, 0)
+        # Darkened text bands with the static text
+        for y0, hud_color, hud_inv_alpha in self._static_hud:
+            rows = display[y0:y0 + hud_color.shape[0]]
+            np.copyto(rows, hud_color + rows * hud_inv_alpha, casting='unsafe')
         
         # Current time info
-        current_time = self.frame_to_time(self.current_frame)
-        start_time = self.frame_to_time(self.start_frame)
-        end_time = self.frame_to_time(self.end_frame)
-        selected_duration = end_time - start_time
+        current_time = self._format_frame_time(self.current_frame)
+        start_time = self._format_frame_time(self.start_frame)
+        end_time = self._format_frame_time(self.end_frame)
+        selected_duration = self._format_frame_time(self.end_frame - self.start_frame)
         
         # Top text
-        cv2.putText(display, f"Current: {format_time_precise(current_time)} (Frame {self.current_frame}/{self.total_frames})", 
+        cv2.putText(display, f"Current: {current_time} (Frame {self.current_frame}/{self.total_frames})", 
                    (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-        cv2.putText(display, f"Start: {format_time_precise(start_time)} | End: {format_time_precise(end_time)} | Duration: {format_time_precise(selected_duration)}", 
+        cv2.putText(display, f"Start: {start_time} | End: {end_time} | Duration: {selected_duration}", 
                    (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 1)
-        cv2.putText(display, f"Total: {format_time_precise(self.duration)}", 
-                   (10, 75), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-        
-        # Bottom instructions
-        cv2.putText(display, "[  ] = Start/End at current | ENTER = Confirm | S = Skip | Q = Quit", 
-                   (10, h - 35), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-        cv2.putText(display, "LEFT/RIGHT = Seek | SHIFT+Arrow = Fine seek | HOME/END = Go to start/end points", 
-                   (10, h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
         # Draw timeline bar
         bar_y = h - 80
@@ -443,6 +614,8 @@ class VideoSeeker:
         print("="*50)
         
         last_shown_frame = -1
+        last_drawn_state = None
+        self._trackbar_pos = 0
         
         while True:
             # Get current frame
@@ -452,12 +625,17 @@ class VideoSeeker:
                     frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
                 last_shown_frame = self.current_frame
             
-            # Draw UI
-            display = self.draw_ui(frame)
-            cv2.imshow(self.window_name, display)
+            # Draw UI (only when the position or selection changed)
+            state = (self.current_frame, self.start_frame, self.end_frame)
+            if state != last_drawn_state:
+                display = self.draw_ui(frame)
+                cv2.imshow(self.window_name, display)
+                last_drawn_state = state
             
-            # Update trackbar position
-            cv2.setTrackbarPos('Position', self.window_name, self.current_frame)
+            # Update trackbar position (setTrackbarPos fires the callback and repaints)
+            if self.current_frame != self._trackbar_pos:
+                cv2.setTrackbarPos('Position', self.window_name, self.current_frame)
+                self._trackbar_pos = self.current_frame
             
             key = cv2.waitKey(30) & 0xFF
             
@@ -492,6 +670,7 @@ class VideoSeeker:
                 self.current_frame = min(self.total_frames - 1, self.current_frame + 1)
         
         self.cap.release()
+        self._close_proxy()
         cv2.destroyAllWindows()
         
         if self.cancelled:
@@ -505,6 +684,33 @@ class VideoSeeker:
         return start_time, end_time, False
 
 
+def save_processed_image(image, output_path, replace=False, target_width=1920,
+                         target_height=1080, blur_radius=50):
+    """
+    Process a (cropped) BGR image and write it to output_path.
+    
+    Runs in a worker process so saving overlaps with cropping the next image.
+    With replace=True the result is written to a temp file first and moved
+    over output_path.
+    
+    Returns:
+        (output_path, width, height) of the written result
+    """
+    result = process_image_cv(
+        image,
+        target_width=target_width,
+        target_height=target_height,
+        blur_radius=blur_radius
+    )
+    if replace:
+        temp_path = output_path.with_name(f"{output_path.stem}_temp{output_path.suffix}")
+        cv2.imwrite(str(temp_path), result)
+        os.replace(temp_path, output_path)
+    else:
+        cv2.imwrite(str(output_path), result)
+    return output_path, result.shape[1], result.shape[0]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Process images and videos: crop, scale to 1080p height, and add blurred padding to 1920p width",
@@ -533,7 +739,6 @@ Time formats supported: seconds (30), MM:SS (1:30), HH:MM:SS (1:30:00)
     parser.add_argument("--images-only", action="store_true", help="Only process image files (skip videos)")
     parser.add_argument("--start", type=str, default=None, help="Video start time (e.g., 30, 1:30, or 0:01:30)")
     parser.add_argument("--end", type=str, default=None, help="Video end time (e.g., 60, 2:00, or 0:02:00)")
-    parser.add_argument("--end", type=str, default=None, help="Video end time (e.g., 60, 2:00, or 0:02:00)")
     parser.add_argument("--no-seek", action="store_true", help="Skip interactive video seeking (use --start/--end or full video)")
     parser.add_argument("--replace", action="store_true", help="Replace original files instead of saving to processed folder")
     
@@ -587,160 +792,132 @@ Time formats supported: seconds (30), MM:SS (1:30), HH:MM:SS (1:30:00)
     file_index = 0
     total_files = len(media_files)
     
-    # Process images
-    for image_path in image_files:
-        file_index += 1
-        print(f"\n[{file_index}/{total_files}] Processing image: {image_path.name}")
+    # Process images (static images are processed and saved in worker
+    # processes while the next one is being cropped). There is one worker per
+    # core, so each runs OpenCV single-threaded to avoid oversubscription
+    image_pool = multiprocessing.Pool(initializer=cv2.setNumThreads, initargs=(1,)) if image_files else None
+    image_jobs = []
+    saved_label = "Replaced original" if args.replace else "Saved"
+    
+    def report_saved(saved):
+        path, width, height = saved
+        print(f"  ✓ {saved_label}: {path.name} ({width}x{height})")
+    
+    def report_failed(error):
+        print(f"  ✗ Error saving image: {error}")
+    
+    try:
+        for image_path in image_files:
+            file_index += 1
+            print(f"\n[{file_index}/{total_files}] Processing image: {image_path.name}")
 
-        # Check for animated WebP
-        if is_animated_webp(image_path):
-            print("  Detected animated WebP")
-            frames = extract_webp_frames(image_path)
-            durations = get_frame_durations(image_path)
-            print(f"  {len(frames)} frames, {len(durations)} durations")
+            # Check for animated WebP
+            if is_animated_webp(image_path):
+                print("  Detected animated WebP")
+                frames = extract_webp_frames(image_path)
+                durations = get_frame_durations(image_path)
+                print(f"  {len(frames)} frames, {len(durations)} durations")
 
-            # Show first frame for cropping (convert to cv2 for the cropper)
-            first_frame_cv = cv2.cvtColor(np.array(frames[0]), cv2.COLOR_RGB2BGR)
-            print(f"  Original size: {first_frame_cv.shape[1]}x{first_frame_cv.shape[0]}")
+                # Show first frame for cropping (convert to cv2 for the cropper)
+                first_frame_cv = cv2.cvtColor(np.array(frames[0]), cv2.COLOR_RGB2BGR)
+                print(f"  Original size: {first_frame_cv.shape[1]}x{first_frame_cv.shape[0]}")
 
-            crop_rect = None
-            if not args.no_crop:
-                cropper = ImageCropper(first_frame_cv, f"Crop: {image_path.name}")
-                cropped_frame, should_quit = cropper.run()
+                crop_rect = None
+                if not args.no_crop:
+                    cropper = ImageCropper(first_frame_cv, f"Crop: {image_path.name}")
+                    cropped_frame, should_quit = cropper.run()
 
-                if should_quit:
-                    print("\n\nProcessing cancelled by user.")
-                    return
+                    if should_quit:
+                        print("\n\nProcessing cancelled by user.")
+                        return
 
-                if cropper.rect is not None:
-                    crop_rect = cropper.rect
-                    print(f"  Crop region: ({crop_rect[0]}, {crop_rect[1]}) to ({crop_rect[2]}, {crop_rect[3]})")
+                    if cropper.rect is not None:
+                        crop_rect = cropper.rect
+                        print(f"  Crop region: ({crop_rect[0]}, {crop_rect[1]}) to ({crop_rect[2]}, {crop_rect[3]})")
 
-            # Process each frame
-            processed_frames: list[Image.Image] = []
-            for i, frame in enumerate(frames):
-                # Crop if needed
-                if crop_rect is not None:
-                    x1, y1, x2, y2 = crop_rect
-                    frame = frame.crop((x1, y1, x2, y2))
+                # Process each frame
+                processed_frames: list[Image.Image] = []
+                for i, frame in enumerate(frames):
+                    # Crop if needed
+                    if crop_rect is not None:
+                        x1, y1, x2, y2 = crop_rect
+                        frame = frame.crop((x1, y1, x2, y2))
 
-                result = process_image_pil(
-                    frame,
-                    target_width=args.width,
-                    target_height=args.height,
-                    blur_radius=args.blur,
-                )
-                processed_frames.append(result)
+                    result = process_image_pil(
+                        frame,
+                        target_width=args.width,
+                        target_height=args.height,
+                        blur_radius=args.blur,
+                    )
+                    processed_frames.append(result)
 
-                if (i + 1) % 10 == 0 or (i + 1) == len(frames):
-                    progress = ((i + 1) / len(frames)) * 100
-                    print(f"\r  Processing frames: {progress:.1f}% ({i + 1}/{len(frames)})", end='')
-            print()
+                    if (i + 1) % 10 == 0 or (i + 1) == len(frames):
+                        progress = ((i + 1) / len(frames)) * 100
+                        print(f"\r  Processing frames: {progress:.1f}% ({i + 1}/{len(frames)})", end='')
+                print()
 
-            # Save result
-            if args.replace:
-                output_path = image_path
-                temp_path = image_path.with_name(f"{image_path.stem}_temp{image_path.suffix}")
-                save_animated_webp(processed_frames, durations, Path(temp_path), quality=95)
-                os.replace(temp_path, output_path)
-                print(f"  ✓ Replaced original: {output_path.name}")
-            else:
-                output_path = output_folder / f"{image_path.stem}_processed{image_path.suffix}"
-                save_animated_webp(processed_frames, durations, output_path, quality=95)
-                print(f"  ✓ Saved: {output_path.name}")
-            processed_count += 1
-            continue
+                # Save result
+                if args.replace:
+                    output_path = image_path
+                    temp_path = image_path.with_name(f"{image_path.stem}_temp{image_path.suffix}")
+                    save_animated_webp(processed_frames, durations, Path(temp_path), quality=95)
+                    os.replace(temp_path, output_path)
+                    print(f"  ✓ Replaced original: {output_path.name}")
+                else:
+                    output_path = output_folder / f"{image_path.stem}_processed{image_path.suffix}"
+                    save_animated_webp(processed_frames, durations, output_path, quality=95)
+                    print(f"  ✓ Saved: {output_path.name}")
+                processed_count += 1
+                continue
 
-        # Load image (static image path)
-        image = cv2.imread(str(image_path))
-        if image is None:
-            print(f"Error: Failed to load image: {image_path}")
-            print("Processing cancelled.")
-            return
-        
-        print(f"  Original size: {image.shape[1]}x{image.shape[0]}")
-        
-        # Interactive cropping
-        if not args.no_crop:
-            cropper = ImageCropper(image, f"Crop: {image_path.name}")
-            cropped_image, should_quit = cropper.run()
-            
-            if should_quit:
-                print("\n\nProcessing cancelled by user.")
+            # Load image (static image path)
+            image = cv2.imread(str(image_path))
+            if image is None:
+                print(f"Error: Failed to load image: {image_path}")
+                print("Processing cancelled.")
                 return
             
-            if cropped_image is None:
-                raise RuntimeError("Cropping failed unexpectedly")
+            print(f"  Original size: {image.shape[1]}x{image.shape[0]}")
             
-            image = cropped_image
-            print(f"  Cropped size: {image.shape[1]}x{image.shape[0]}")
-        
-        # Process image
-        result = process_image_cv(
-            image,
-            target_width=args.width,
-            target_height=args.height,
-            blur_radius=args.blur
-        )
-        
-        # Save result
-        # Save result
-        if args.replace:
-            output_path = image_path
-            # Save to temp then replace
-            temp_path = image_path.with_name(f"{image_path.stem}_temp{image_path.suffix}")
-            cv2.imwrite(str(temp_path), result)
-            os.replace(temp_path, output_path)
-            print(f"  ✓ Replaced original: {output_path.name} ({result.shape[1]}x{result.shape[0]})")
-        else:
-            output_path = output_folder / f"{image_path.stem}_processed{image_path.suffix}"
-            cv2.imwrite(str(output_path), result)
-            print(f"  ✓ Saved: {output_path.name} ({result.shape[1]}x{result.shape[0]})")
-        processed_count += 1
-    
-    # Process videos
-    for video_path in video_files:
-        file_index += 1
-        print(f"\n[{file_index}/{total_files}] Processing video: {video_path.name}")
-        
-        # Determine start/end times
-        video_start = start_time
-        video_end = end_time
-        
-        # Interactive seeking if not disabled and no times provided via CLI
-        if not args.no_seek and (video_start is None and video_end is None):
-            seeker = VideoSeeker(video_path, f"Seek: {video_path.name}")
-            video_start, video_end, should_quit = seeker.run()
-            
-            if should_quit:
-                print("\n\nProcessing cancelled by user.")
-                return
-        
-        # Get crop rectangle from a frame
-        crop_rect = None
-        if not args.no_crop:
-            # Extract a frame for crop preview
-            preview_frame = extract_frame_for_crop(video_path, video_start)
-            print(f"  Frame size: {preview_frame.shape[1]}x{preview_frame.shape[0]}")
-            cropper = ImageCropper(preview_frame, f"Crop frame: {video_path.name}")
-            cropped_frame, should_quit = cropper.run()
-            
-            if should_quit:
-                print("\n\nProcessing cancelled by user.")
-                return
-            
-            if cropper.rect is not None:
-                crop_rect = cropper.rect
-                print(f"  Crop region: ({crop_rect[0]}, {crop_rect[1]}) to ({crop_rect[2]}, {crop_rect[3]})")
-        
-        # Process video
-        # Process video
-        if args.replace:
-            # Create a temp output file first
-            output_path = video_path.with_name(f"{video_path.stem}_processed_temp{video_path.suffix}")
-        else:
-            output_path = output_folder / f"{video_path.stem}_processed.mp4"
+            # Interactive cropping
+            if not args.no_crop:
+                cropper = ImageCropper(image, f"Crop: {image_path.name}")
+                cropped_image, should_quit = cropper.run()
+                
+                if should_quit:
+                    print("\n\nProcessing cancelled by user.")
+                    return
+                
+                if cropped_image is None:
+                    raise RuntimeError("Cropping failed unexpectedly")
+                
+                image = cropped_image
+                print(f"  Cropped size: {image.shape[1]}x{image.shape[0]}")
             
+            # Process and save in the background
+            if args.replace:
+                output_path = image_path
+            else:
+                output_path = output_folder / f"{image_path.stem}_processed{image_path.suffix}"
+            image_jobs.append(image_pool.apply_async(
+                save_processed_image,
+                (image, output_path, args.replace, args.width, args.height, args.blur),
+                callback=report_saved,
+                error_callback=report_failed
+            ))
+    finally:
+        # Let queued saves finish, even if the user quit
+        if image_pool is not None:
+            image_pool.close()
+            image_pool.join()
+            processed_count += sum(1 for job in image_jobs if job.successful())
+    
+    # Process videos (encodes run one at a time in the background while the
+    # next video's seek/crop UI is shown)
+    video_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    video_jobs = []
+    
+    def encode_video(video_path, output_path, crop_rect, video_start, video_end):
         process_video(
             video_path,
             output_path,
@@ -766,7 +943,61 @@ Time formats supported: seconds (30), MM:SS (1:30), HH:MM:SS (1:30:00)
                      print(f"    Saved as: {final_fallback.name}")
         else:
             print(f"  ✓ Saved: {output_path.name}")
-        processed_count += 1
+    
+    def report_video_error(job, video_path):
+        error = job.exception()
+        if error is not None:
+            print(f"  ✗ Error processing {video_path.name}: {error}")
+    
+    try:
+        for video_path in video_files:
+            file_index += 1
+            print(f"\n[{file_index}/{total_files}] Processing video: {video_path.name}")
+            
+            # Determine start/end times
+            video_start = start_time
+            video_end = end_time
+            
+            # Interactive seeking if not disabled and no times provided via CLI
+            if not args.no_seek and (video_start is None and video_end is None):
+                seeker = VideoSeeker(video_path, f"Seek: {video_path.name}")
+                video_start, video_end, should_quit = seeker.run()
+                
+                if should_quit:
+                    print("\n\nProcessing cancelled by user.")
+                    return
+            
+            # Get crop rectangle from a frame
+            crop_rect = None
+            if not args.no_crop:
+                # Extract a frame for crop preview
+                preview_frame = extract_frame_for_crop(video_path, video_start)
+                print(f"  Frame size: {preview_frame.shape[1]}x{preview_frame.shape[0]}")
+                cropper = ImageCropper(preview_frame, f"Crop frame: {video_path.name}")
+                cropped_frame, should_quit = cropper.run()
+                
+                if should_quit:
+                    print("\n\nProcessing cancelled by user.")
+                    return
+                
+                if cropper.rect is not None:
+                    crop_rect = cropper.rect
+                    print(f"  Crop region: ({crop_rect[0]}, {crop_rect[1]}) to ({crop_rect[2]}, {crop_rect[3]})")
+            
+            # Encode in the background
+            if args.replace:
+                # Create a temp output file first
+                output_path = video_path.with_name(f"{video_path.stem}_processed_temp{video_path.suffix}")
+            else:
+                output_path = output_folder / f"{video_path.stem}_processed.mp4"
+            
+            job = video_pool.submit(encode_video, video_path, output_path, crop_rect, video_start, video_end)
+            job.add_done_callback(lambda job, path=video_path: report_video_error(job, path))
+            video_jobs.append(job)
+    finally:
+        # Let queued encodes finish, even if the user quit
+        video_pool.shutdown(wait=True)
+        processed_count += sum(1 for job in video_jobs if job.exception() is None)
     
     # Summary
     print("\n" + "="*50)
@@ -16,26 +16,34 @@ For videos: ffmpeg must be installed and in PATH
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
+from PIL import Image, ImageDraw, ImageTk
 import numpy as np
 import cv2
 import os
+import bisect
 import threading
 import queue
 import time
-import tempfile
-import shutil
+import subprocess
 import concurrent.futures
+from collections import OrderedDict, deque
 from pathlib import Path
 
 from media_utils import (
-    IMAGE_EXTENSIONS,
-    VIDEO_EXTENSIONS,
     MIN_CROP_SIZE,
+    PREVIEW_PROXY_MIN_BYTES,
     check_ffmpeg,
-    run_ffmpeg_encode,
+    detect_hw_encoder,
+    get_media_files,
+    is_video,
+    open_video_capture,
+    start_preview_proxy,
+    stop_preview_proxy,
+    start_ffmpeg_rawvideo_encode,
+    finish_ffmpeg_encode,
     format_time,
     clamp,
+    compose_blur_padded,
     process_image_pil,
     normalize_rect,
     is_valid_crop_rect,
@@ -47,6 +55,61 @@ from media_utils import (
 )
 
 
+def _update_photo(photo, pil_image):
+    """
+    Return a PhotoImage showing pil_image, reusing photo when possible.
+    
+    Pasting into an existing PhotoImage of the same size updates the pixels in
+    place, so the canvas items that display it stay valid and Tk does not
+    allocate a new image on every redraw. paste() converts to the photo's
+    mode, so callers drop the old photo when the source mode can change.
+    """
+    if photo is not None and photo.width() == pil_image.width and photo.height() == pil_image.height:
+        photo.paste(pil_image)
+        return photo
+    return ImageTk.PhotoImage(pil_image)
+
+
+def _advance_capture(cap, next_frame, target, max_skip):
+    """
+    Position cap so that its next grab() returns frame target.
+    
+    next_frame is the frame the capture would return next (None if unknown).
+    Seeking restarts decoding from the previous keyframe, so short forward
+    jumps are cheaper to decode through with grab(), which skips the BGR
+    conversion. Reading a range frame by frame is then linear, not quadratic.
+    """
+    skip = target - next_frame if next_frame is not None else -1
+    if 0 <= skip < max_skip:
+        for _ in range(skip):
+            cap.grab()
+    else:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+
+
+def _to_display_image(frame, size):
+    """
+    Downscale a BGR frame to size and return it as an RGB PIL Image.
+    
+    The bulk of the reduction is an integer-factor INTER_AREA resize, which
+    OpenCV runs as a plain block average (several times faster than a
+    fractional area resize). The few edge pixels that don't fill a block are
+    dropped so the ratio stays exact, and the remaining <2x step is bilinear.
+    This mirrors what reducing_gap does for the PIL path in ImageCropCanvas.
+    """
+    height, width = frame.shape[:2]
+    factor = min(width // size[0], height // size[1])
+    if factor > 1:
+        frame = cv2.resize(
+            frame[:height - height % factor, :width - width % factor],
+            (width // factor, height // factor),
+            interpolation=cv2.INTER_AREA
+        )
+    if size != (frame.shape[1], frame.shape[0]):
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+    return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
 class ImageCropCanvas(tk.Canvas):
     """Custom canvas for interactive image cropping."""
     
@@ -56,7 +119,10 @@ class ImageCropCanvas(tk.Canvas):
         self.photo = None
         self.original_image = None
         self.display_scale = 1.0
+        self.image_item = None  # Persistent canvas item showing self.photo
+        self._rendered = None  # (original_image, display size) that self.photo shows
         self.rect_id = None
+        self._redraw_pending = False
         self.start_x = None
         self.start_y = None
         self.crop_rect = None  # (x1, y1, x2, y2) in original image coordinates
@@ -69,7 +135,20 @@ class ImageCropCanvas(tk.Canvas):
     def set_image(self, pil_image):
         """Set the image to display."""
         self.original_image = pil_image
-        self.crop_rect = None
+        # Drop the previous image's selection, rectangle included
+        self.reset_selection()
+        self.photo = None  # The new image may have a different mode
+        self._rendered = None
+        self._update_display()
+        
+    def _request_redraw(self):
+        """Schedule _update_display for the next idle cycle, coalescing repeated requests."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._do_redraw)
+    
+    def _do_redraw(self):
+        self._redraw_pending = False
         self._update_display()
         
     def _update_display(self):
@@ -95,17 +174,35 @@ class ImageCropCanvas(tk.Canvas):
         display_width = int(img_width * self.display_scale)
         display_height = int(img_height * self.display_scale)
         
-        self.image = self.original_image.resize(
-            (display_width, display_height), 
-            Image.Resampling.LANCZOS
+        # Only resample when the image or its display size changed; redraws
+        # for the crop rectangle or a same-size resize reuse the photo
+        rendered = (self.original_image, (display_width, display_height))
+        photo_changed = (
+            self.photo is None
+            or self._rendered is None
+            or rendered[0] is not self._rendered[0]
+            or rendered[1] != self._rendered[1]
         )
-        self.photo = ImageTk.PhotoImage(self.image)
+        if photo_changed:
+            # Bilinear after an integer box reduction (reducing_gap) is ~3x faster
+            # than Lanczos and indistinguishable at preview size
+            self.image = self.original_image.resize(
+                (display_width, display_height), 
+                Image.Resampling.BILINEAR,
+                reducing_gap=2.0
+            )
+            self.photo = _update_photo(self.photo, self.image)
+            self._rendered = rendered
         
-        # Center image on canvas
-        self.delete("all")
+        # Center image on canvas, moving the existing item if there is one
         self.image_x = (canvas_width - display_width) // 2
         self.image_y = (canvas_height - display_height) // 2
-        self.create_image(self.image_x, self.image_y, anchor=tk.NW, image=self.photo)
+        if self.image_item is None:
+            self.image_item = self.create_image(self.image_x, self.image_y, anchor=tk.NW, image=self.photo)
+        else:
+            self.coords(self.image_item, self.image_x, self.image_y)
+            if photo_changed:
+                self.itemconfigure(self.image_item, image=self.photo)
         
         # Redraw crop rectangle if exists
         if self.crop_rect:
@@ -121,12 +218,7 @@ class ImageCropCanvas(tk.Canvas):
             
     def on_drag(self, event):
         """Handle mouse drag."""
-        if self.rect_id:
-            self.delete(self.rect_id)
-        self.rect_id = self.create_rectangle(
-            self.start_x, self.start_y, event.x, event.y,
-            outline="#00FF00", width=2
-        )
+        self._set_rect_coords(self.start_x, self.start_y, event.x, event.y)
         
     def on_release(self, event):
         """Handle mouse release."""
@@ -167,12 +259,17 @@ class ImageCropCanvas(tk.Canvas):
         canvas_x2 = self.image_x + int(x2 * self.display_scale)
         canvas_y2 = self.image_y + int(y2 * self.display_scale)
         
+        self._set_rect_coords(canvas_x1, canvas_y1, canvas_x2, canvas_y2)
+    
+    def _set_rect_coords(self, x1, y1, x2, y2):
+        """Move the crop rectangle item, creating it if needed."""
         if self.rect_id:
-            self.delete(self.rect_id)
-        self.rect_id = self.create_rectangle(
-            canvas_x1, canvas_y1, canvas_x2, canvas_y2,
-            outline="#00FF00", width=2
-        )
+            self.coords(self.rect_id, x1, y1, x2, y2)
+        else:
+            self.rect_id = self.create_rectangle(
+                x1, y1, x2, y2,
+                outline="#00FF00", width=2
+            )
         
     def get_cropped_image(self):
         """Get the cropped image based on current selection."""
@@ -191,16 +288,53 @@ class ImageCropCanvas(tk.Canvas):
         if self.rect_id:
             self.delete(self.rect_id)
             self.rect_id = None
+    
+    def clear(self):
+        """Remove the image and all canvas items."""
+        self.delete("all")
+        self.image_item = None
+        self.rect_id = None
+        self.photo = None
+        self._rendered = None
+        self.original_image = None
 
 
 class VideoSeekerCanvas(tk.Canvas):
     """Custom canvas for video seeking with timeline AND crop rectangle drawing."""
     
+    FRAME_CACHE_SIZE = 64  # Display-sized frames kept by the decode workers
+    PREFETCH_AHEAD = 4  # Frames decoded past a request while the worker is idle
+    MAX_GRAB_SKIP = 50  # Forward jumps shorter than this decode on instead of seeking
+    
+    # Decoded display frames, shared by all seekers and kept across loads so
+    # re-opening a video (e.g. after skipping back to it) hits the cache:
+    # (video_key, frame_num, size) -> PIL Image, see load_video for video_key
+    _frame_cache = OrderedDict()
+    _cache_lock = threading.Lock()
+    
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
         self.video_path = None
         self.cap = None
         self.photo = None
+        self._items = {}  # Persistent canvas items, see _create_items
+        self._shown_image = None  # PIL image currently in self.photo
+        self._timeline_key = None  # What the static timeline items were laid out for
+        self._kf_strip_key = None  # What the keyframe marker strip was drawn for
+        self._kf_strip_photo = None
+        self._frame_buf = None  # Reused decode target (see _read_frame_rgb)
+        self._cap_next_frame = None  # Frame self.cap returns on the next grab()
+        
+        # Background decoding: the worker owns its own VideoCapture and fills
+        # the LRU cache, so seeking never blocks the Tk thread on a decode
+        self._video_key = None
+        self._decode_thread = None
+        self._decode_requests = None
+        self._decode_stop = None
+        self._redraw_pending = False
+        # (path, VideoCapture) opened ahead of time by prefetch_video
+        self._warm_cap = None
+        self._warm_lock = threading.Lock()
         self.fps = 0
         self.total_frames = 0
         self.duration = 0
@@ -226,9 +360,12 @@ class VideoSeekerCanvas(tk.Canvas):
         
         # Crop keyframes: dict mapping frame number to crop rect (x1, y1, x2, y2)
         self.crop_keyframes = {}
+        # Derived from crop_keyframes, reset by _keyframes_changed()
+        self._kf_sorted = None
+        self._crop_cache = None  # (frame_num, interpolated crop)
+        self._handle_points = {}  # Handle name -> canvas center, see _layout_overlay
         # Current crop being drawn (not yet added as keyframe)
         self._pending_crop_rect = None
-        self.rect_id = None
         self.drawing_crop = False
         self.crop_start_x = None
         self.crop_start_y = None
@@ -243,6 +380,7 @@ class VideoSeekerCanvas(tk.Canvas):
         # Track if we're dragging on timeline vs video
         self.dragging_timeline_start = False
         self.dragging_timeline_end = False
+        self.scrubbing_timeline = False  # Plain click-drag along the timeline
         
         # Bind mouse events
         self.bind("<ButtonPress-1>", self.on_left_press)
@@ -258,7 +396,19 @@ class VideoSeekerCanvas(tk.Canvas):
         if self.cap:
             self.cap.release()
         
-        self.cap = cv2.VideoCapture(self.video_path)
+        self._stop_decode_worker()
+        self.photo = None
+        self._shown_image = None
+        
+        with self._warm_lock:
+            warm, self._warm_cap = self._warm_cap, None
+        if warm is not None and warm[0] == self.video_path and warm[1].isOpened():
+            self.cap = warm[1]
+        else:
+            if warm is not None:
+                warm[1].release()
+            self.cap = open_video_capture(self.video_path)
+        self._cap_next_frame = 0
         if not self.cap.isOpened():
             return False
         
@@ -273,10 +423,220 @@ class VideoSeekerCanvas(tk.Canvas):
         self.end_frame = self.total_frames - 1
         self.crop_keyframes = {}
         self._pending_crop_rect = None
-        self.rect_id = None
+        self._keyframes_changed()
+        
+        # Large files are scrubbed through a screen-sized proxy once it has
+        # been encoded, so the worker decodes near display resolution
+        proxy = None
+        if os.path.getsize(self.video_path) > PREVIEW_PROXY_MIN_BYTES and check_ffmpeg():
+            scale = min(self.winfo_screenwidth() / self.video_width,
+                        self.winfo_screenheight() / self.video_height, 1.0)
+            proxy = start_preview_proxy(self.video_path, int(self.video_width * scale))
+        
+        # Cached frames stay valid while the file is unchanged; replace mode
+        # overwrites videos in place, so modification time and size are part
+        # of the key
+        stat = os.stat(self.video_path)
+        self._video_key = (os.path.abspath(self.video_path), stat.st_mtime_ns, stat.st_size)
+        
+        self._decode_requests = queue.Queue(maxsize=4)
+        self._decode_stop = threading.Event()
+        self._decode_thread = threading.Thread(
+            target=self._decode_worker,
+            args=(self.video_path, self._video_key, self._decode_requests, self._decode_stop, proxy),
+            daemon=True
+        )
+        self._decode_thread.start()
         
         self._update_display()
         return True
+    
+    def prefetch_video(self, video_path):
+        """
+        Open the capture of the video that is likely loaded next.
+        
+        Runs in the background while the current file is reviewed; load_video
+        takes the capture over instead of opening the file itself.
+        """
+        video_path = str(video_path)
+        
+        def open_capture():
+            cap = open_video_capture(video_path)
+            with self._warm_lock:
+                old, self._warm_cap = self._warm_cap, (video_path, cap)
+            if old is not None:
+                old[1].release()
+        
+        threading.Thread(target=open_capture, daemon=True).start()
+    
+    def _stop_decode_worker(self, wait=False):
+        """
+        Stop the decode worker of the current video.
+        
+        With wait, block until the worker has exited (and removed its proxy).
+        """
+        if self._decode_stop is not None:
+            self._decode_stop.set()
+            if wait:
+                self._decode_thread.join(timeout=5)
+        self._decode_thread = None
+        self._decode_requests = None
+        self._decode_stop = None
+    
+    def _decode_worker(self, video_path, video_key, requests, stop, proxy=None):
+        """
+        Decode requested frames into the frame cache.
+        
+        Only the newest pending request is served, since older ones are
+        positions the user has already scrubbed past. While no request is
+        waiting, the next few frames are decoded sequentially (cheap, no seek)
+        so stepping forward hits the cache.
+        
+        proxy is a (process, path) pair from start_preview_proxy; the worker
+        switches to it once the encode succeeds and deletes it on exit.
+        """
+        cap = open_video_capture(video_path)
+        frame_buf = None
+        next_frame = None  # Frame the capture returns on the next grab()
+        proxy_proc, proxy_path = proxy or (None, None)
+        try:
+            while not stop.is_set():
+                if proxy_proc is not None and proxy_proc.poll() is not None:
+                    if proxy_proc.returncode == 0:
+                        proxy_cap = open_video_capture(proxy_path)
+                        if proxy_cap.isOpened() and int(proxy_cap.get(cv2.CAP_PROP_FRAME_COUNT)) > 0:
+                            cap.release()
+                            cap = proxy_cap
+                            next_frame = None
+                        else:
+                            proxy_cap.release()
+                    proxy_proc = None
+                
+                try:
+                    request = requests.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                while True:
+                    try:
+                        request = requests.get_nowait()
+                    except queue.Empty:
+                        break
+                frame_num, size = request
+                
+                for ahead in range(self.PREFETCH_AHEAD + 1):
+                    if stop.is_set() or (ahead and not requests.empty()):
+                        break
+                    target = frame_num + ahead
+                    key = (video_key, target, size)
+                    with self._cache_lock:
+                        cached = key in self._frame_cache
+                    if not cached:
+                        _advance_capture(cap, next_frame, target, self.MAX_GRAB_SKIP)
+                        ret = cap.grab()
+                        if ret:
+                            ret, frame_buf = cap.retrieve(frame_buf)
+                        if not ret:
+                            next_frame = None
+                            break
+                        next_frame = target + 1
+                        image = _to_display_image(frame_buf, size)
+                        with self._cache_lock:
+                            if stop.is_set():
+                                return  # Video released or another one loaded
+                            self._frame_cache[key] = image
+                            while len(self._frame_cache) > self.FRAME_CACHE_SIZE:
+                                self._frame_cache.popitem(last=False)
+                    if ahead == 0:
+                        try:
+                            self.after(0, self._on_frame_decoded, frame_num, size)
+                        except (RuntimeError, tk.TclError):
+                            return  # Canvas destroyed
+        finally:
+            cap.release()
+            if proxy is not None:
+                stop_preview_proxy(*proxy)
+    
+    def _try_get_frame(self, frame_num, size):
+        """
+        Return the display image for a frame without waiting for a decode.
+        
+        On a cache miss the decode worker is asked for the frame (and triggers
+        a redraw when it's ready), and the last shown image stands in for it,
+        resized if the display size changed. Returns None before the first
+        frame of a video has been decoded.
+        """
+        image = self._cached_frame(frame_num, size)
+        if image is not None:
+            return image
+        self._request_frame(frame_num, size)
+        if self._shown_image is not None and self._shown_image.size != size:
+            return self._shown_image.resize(size, Image.Resampling.BILINEAR)
+        return self._shown_image
+    
+    def _cached_frame(self, frame_num, size):
+        """Return a decoded display frame from the cache, or None."""
+        key = (self._video_key, frame_num, size)
+        with self._cache_lock:
+            image = self._frame_cache.get(key)
+            if image is not None:
+                self._frame_cache.move_to_end(key)
+            return image
+    
+    def _request_frame(self, frame_num, size):
+        """Ask the decode worker for a frame; the oldest request is dropped when full."""
+        requests = self._decode_requests
+        if requests is None:
+            return
+        try:
+            requests.put_nowait((frame_num, size))
+        except queue.Full:
+            try:
+                requests.get_nowait()
+            except queue.Empty:
+                pass
+            requests.put_nowait((frame_num, size))
+    
+    def _on_frame_decoded(self, frame_num, size):
+        """Redraw once the frame being shown has been decoded (Tk thread)."""
+        if self.cap is not None and frame_num == self.current_frame and size == (self.display_width, self.display_height):
+            self._request_redraw()
+    
+    def _request_redraw(self):
+        """Schedule _update_display for the next idle cycle, coalescing repeated requests."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._do_redraw)
+    
+    def _do_redraw(self):
+        self._redraw_pending = False
+        self._update_display()
+        
+    def _create_items(self):
+        """Create the persistent canvas items that _update_display repositions."""
+        items = {}
+        items['image'] = self.create_image(0, 0, anchor=tk.NW)
+        items['rect'] = self.create_rectangle(0, 0, 0, 0, width=2, state=tk.HIDDEN)
+        for name in ('tl', 'tr', 'bl', 'br'):
+            items[name] = self.create_rectangle(0, 0, 0, 0, outline="#000000",
+                                                tags=f"handle_{name}", state=tk.HIDDEN)
+        # Center handle for translation
+        items['center'] = self.create_oval(0, 0, 0, 0, outline="#000000",
+                                           tags="handle_center", state=tk.HIDDEN)
+        
+        # Timeline, in drawing order so the current frame line is on top
+        items['bar'] = self.create_rectangle(0, 0, 0, 0, fill="#333333", outline="#555555")
+        items['selection'] = self.create_rectangle(0, 0, 0, 0, fill="#006600", outline="")
+        items['start_line'] = self.create_line(0, 0, 0, 0, fill="#00FF00", width=3)
+        items['end_line'] = self.create_line(0, 0, 0, 0, fill="#FF0000", width=3)
+        items['current_line'] = self.create_line(0, 0, 0, 0, fill="#FFFF00", width=2)
+        items['start_text'] = self.create_text(0, 0, anchor=tk.W, fill="#00FF00", font=("Segoe UI", 9))
+        items['end_text'] = self.create_text(0, 0, anchor=tk.E, fill="#FF6666", font=("Segoe UI", 9))
+        items['info_text'] = self.create_text(0, 0, anchor=tk.CENTER, fill="#FFFFFF", font=("Segoe UI", 9))
+        items['keyframes'] = self.create_image(0, 0, anchor=tk.NW)
+        self._items = items
+        self._timeline_key = None
+        self._kf_strip_key = None
+        self._info_text = None
         
     def _update_display(self):
         """Update the canvas display with current frame and timeline."""
@@ -290,40 +650,48 @@ class VideoSeekerCanvas(tk.Canvas):
             canvas_width = 800
             canvas_height = 600
         
-        # Get current frame
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.current_frame)
-        ret, frame = self.cap.read()
-        if not ret:
-            return
-        
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        pil_image = Image.fromarray(frame_rgb)
-        
         # Calculate scale to fit video in canvas (leave room for timeline)
         available_height = canvas_height - self.timeline_height - 20
         scale_w = canvas_width / self.video_width
         scale_h = available_height / self.video_height
         self.display_scale = min(scale_w, scale_h, 1.0)
         
-        self.display_width = int(self.video_width * self.display_scale)
-        self.display_height = int(self.video_height * self.display_scale)
+        self.display_width = max(1, int(self.video_width * self.display_scale))
+        self.display_height = max(1, int(self.video_height * self.display_scale))
         
-        display_image = pil_image.resize((self.display_width, self.display_height), Image.Resampling.LANCZOS)
-        self.photo = ImageTk.PhotoImage(display_image)
+        # Get current frame, already scaled to the display size (never blocks
+        # on decoding, see _try_get_frame)
+        display_image = self._try_get_frame(self.current_frame, (self.display_width, self.display_height))
+        if display_image is not None and display_image is not self._shown_image:
+            self.photo = _update_photo(self.photo, display_image)
+            self._shown_image = display_image
         
-        # Clear and redraw
-        self.delete("all")
+        if not self._items:
+            self._create_items()
+        items = self._items
         
         # Draw video frame
         self.image_x = (canvas_width - self.display_width) // 2
         self.image_y = 10
-        self.create_image(self.image_x, self.image_y, anchor=tk.NW, image=self.photo)
+        self.coords(items['image'], self.image_x, self.image_y)
+        if self.photo is not None:
+            self.itemconfigure(items['image'], image=self.photo)
+        
+        self._layout_overlay()
+        
+        # Draw timeline
+        self.timeline_y = self.image_y + self.display_height + 10
+        self._draw_timeline(canvas_width)
+        
+    def _layout_overlay(self):
+        """Move the crop rectangle and handles to the crop of the current frame."""
+        items = self._items
         
         # Get crop for current frame (from keyframes or pending)
         current_crop = self.get_crop_for_frame(self.current_frame)
         
         # Draw crop rectangle and handles if exists
+        handles = ('rect', 'tl', 'tr', 'bl', 'br', 'center')
         if current_crop:
             x1, y1, x2, y2 = current_crop
             canvas_x1 = self.image_x + int(x1 * self.display_scale)
@@ -335,104 +703,106 @@ class VideoSeekerCanvas(tk.Canvas):
             is_keyframe = self.current_frame in self.crop_keyframes
             outline_color = "#00FF00" if is_keyframe else "#FFFF00"
             
-            self.rect_id = self.create_rectangle(
-                canvas_x1, canvas_y1, canvas_x2, canvas_y2,
-                outline=outline_color, width=2
-            )
+            self.coords(items['rect'], canvas_x1, canvas_y1, canvas_x2, canvas_y2)
+            self.itemconfigure(items['rect'], outline=outline_color, state=tk.NORMAL)
             
-            # Draw corner handles
+            # Corner handles
             hs = self.handle_size
-            handle_color = outline_color
-            
-            # Top-left
-            self.create_rectangle(canvas_x1 - hs, canvas_y1 - hs, canvas_x1 + hs, canvas_y1 + hs,
-                                 fill=handle_color, outline="#000000", tags="handle_tl")
-            # Top-right
-            self.create_rectangle(canvas_x2 - hs, canvas_y1 - hs, canvas_x2 + hs, canvas_y1 + hs,
-                                 fill=handle_color, outline="#000000", tags="handle_tr")
-            # Bottom-left
-            self.create_rectangle(canvas_x1 - hs, canvas_y2 - hs, canvas_x1 + hs, canvas_y2 + hs,
-                                 fill=handle_color, outline="#000000", tags="handle_bl")
-            # Bottom-right
-            self.create_rectangle(canvas_x2 - hs, canvas_y2 - hs, canvas_x2 + hs, canvas_y2 + hs,
-                                 fill=handle_color, outline="#000000", tags="handle_br")
-            
-            # Center handle for translation
             cx = (canvas_x1 + canvas_x2) // 2
             cy = (canvas_y1 + canvas_y2) // 2
-            self.create_oval(cx - hs, cy - hs, cx + hs, cy + hs,
-                            fill=handle_color, outline="#000000", tags="handle_center")
-        
-        # Draw timeline
-        self.timeline_y = self.image_y + self.display_height + 10
-        self._draw_timeline(canvas_width)
+            self._handle_points = {
+                'tl': (canvas_x1, canvas_y1), 'tr': (canvas_x2, canvas_y1),
+                'bl': (canvas_x1, canvas_y2), 'br': (canvas_x2, canvas_y2),
+                'center': (cx, cy),
+            }
+            for name, (hx, hy) in self._handle_points.items():
+                self.coords(items[name], hx - hs, hy - hs, hx + hs, hy + hs)
+                self.itemconfigure(items[name], fill=outline_color, state=tk.NORMAL)
+        else:
+            self._handle_points = {}
+            for name in handles:
+                self.itemconfigure(items[name], state=tk.HIDDEN)
         
     def _draw_timeline(self, canvas_width):
-        """Draw the timeline with markers."""
+        """Position the timeline items and update the markers."""
+        items = self._items
         margin = self.timeline_margin
         bar_height = self.timeline_bar_height
         bar_y = self.timeline_y
         bar_width = canvas_width - 2 * margin
+        text_y = bar_y + bar_height + 15
         
         # Store for click detection
         self.timeline_bar_y = bar_y
         
-        # Background bar
-        self.create_rectangle(margin, bar_y, margin + bar_width, bar_y + bar_height, 
-                            fill="#333333", outline="#555555")
-        
-        # Selected region (green)
-        if self.total_frames > 1:
-            start_x = margin + int((self.start_frame / (self.total_frames - 1)) * bar_width)
-            end_x = margin + int((self.end_frame / (self.total_frames - 1)) * bar_width)
-            self.create_rectangle(start_x, bar_y, end_x, bar_y + bar_height, 
-                                fill="#006600", outline="")
-        
-        # Start/End markers (drawn first so current frame line is on top)
-        if self.total_frames > 1:
-            start_x = margin + int((self.start_frame / (self.total_frames - 1)) * bar_width)
-            end_x = margin + int((self.end_frame / (self.total_frames - 1)) * bar_width)
-            self.create_line(start_x, bar_y - 8, start_x, bar_y + bar_height + 8, 
-                           fill="#00FF00", width=3)
-            self.create_line(end_x, bar_y - 8, end_x, bar_y + bar_height + 8, 
-                           fill="#FF0000", width=3)
-        
-        # Current position marker (yellow line) - drawn last to be on top
+        # Bar, selected region and start/end markers only change with the
+        # layout or the selection, not while seeking
+        static_key = (canvas_width, bar_y, self.start_frame, self.end_frame, self.total_frames, self.fps)
+        if static_key != self._timeline_key:
+            self._timeline_key = static_key
+            
+            # Background bar
+            self.coords(items['bar'], margin, bar_y, margin + bar_width, bar_y + bar_height)
+            
+            # Selected region (green) and start/end markers
+            if self.total_frames > 1:
+                start_x = margin + int((self.start_frame / (self.total_frames - 1)) * bar_width)
+                end_x = margin + int((self.end_frame / (self.total_frames - 1)) * bar_width)
+                self.coords(items['selection'], start_x, bar_y, end_x, bar_y + bar_height)
+                self.coords(items['start_line'], start_x, bar_y - 8, start_x, bar_y + bar_height + 8)
+                self.coords(items['end_line'], end_x, bar_y - 8, end_x, bar_y + bar_height + 8)
+                state = tk.NORMAL
+            else:
+                state = tk.HIDDEN
+            for name in ('selection', 'start_line', 'end_line', 'current_line'):
+                self.itemconfigure(items[name], state=state)
+            
+            start_time = self._format_time(self.start_frame / self.fps if self.fps else 0)
+            end_time = self._format_time(self.end_frame / self.fps if self.fps else 0)
+            self.coords(items['start_text'], margin, text_y)
+            self.itemconfigure(items['start_text'], text=f"Start: {start_time}")
+            self.coords(items['end_text'], canvas_width - margin, text_y)
+            self.itemconfigure(items['end_text'], text=f"End: {end_time}")
+            self.coords(items['info_text'], canvas_width // 2, text_y)
+        
+        # Current position marker (yellow)
         if self.total_frames > 1:
             curr_x = margin + int((self.current_frame / (self.total_frames - 1)) * bar_width)
-            self.create_line(curr_x, bar_y - 5, curr_x, bar_y + bar_height + 5, 
-                           fill="#FFFF00", width=2)
+            self.coords(items['current_line'], curr_x, bar_y - 5, curr_x, bar_y + bar_height + 5)
         
-        # Time labels
+        # Current time and keyframe count. The label only changes once per
+        # second of video, so unchanged text is not pushed back into Tk
+        # (every text reconfigure re-lays out and redraws the item)
         current_time = self._format_time(self.current_frame / self.fps if self.fps else 0)
-        start_time = self._format_time(self.start_frame / self.fps if self.fps else 0)
-        end_time = self._format_time(self.end_frame / self.fps if self.fps else 0)
         total_time = self._format_time(self.duration)
-        
-        self.create_text(margin, bar_y + bar_height + 15, anchor=tk.W, 
-                        text=f"Start: {start_time}", fill="#00FF00", font=("Segoe UI", 9))
-        self.create_text(canvas_width - margin, bar_y + bar_height + 15, anchor=tk.E,
-                        text=f"End: {end_time}", fill="#FF6666", font=("Segoe UI", 9))
-        
-        # Show keyframe count
         kf_count = len(self.crop_keyframes)
         kf_text = f"Keyframes: {kf_count}"
-        self.create_text(canvas_width // 2, bar_y + bar_height + 15, anchor=tk.CENTER,
-                        text=f"Current: {current_time} / {total_time} | {kf_text}", fill="#FFFFFF", font=("Segoe UI", 9))
-        
-        # Draw keyframe markers on timeline
-        if self.total_frames > 1:
-            for kf_frame in self.crop_keyframes.keys():
+        info_text = f"Current: {current_time} / {total_time} | {kf_text}"
+        if info_text != self._info_text:
+            self._info_text = info_text
+            self.itemconfigure(items['info_text'], text=info_text)
+        
+        # Keyframe diamond markers, all drawn into one transparent strip image
+        # that is only re-rendered when the keyframes or the bar change
+        size = 5
+        kf_frames = self._sorted_keyframes() if self.total_frames > 1 else []
+        strip_key = (tuple(kf_frames), canvas_width, self.total_frames)
+        if strip_key != self._kf_strip_key:
+            strip = Image.new("RGBA", (max(1, canvas_width), size * 2 + 1))
+            draw = ImageDraw.Draw(strip)
+            for kf_frame in kf_frames:
                 kf_x = margin + int((kf_frame / (self.total_frames - 1)) * bar_width)
-                # Draw diamond marker
-                size = 5
-                self.create_polygon(
-                    kf_x, bar_y - 3,       # top
-                    kf_x + size, bar_y - 3 - size,  # right
-                    kf_x, bar_y - 3 - size * 2,     # top
-                    kf_x - size, bar_y - 3 - size,  # left
+                draw.polygon(
+                    [(kf_x, size * 2),   # bottom
+                     (kf_x + size, size),  # right
+                     (kf_x, 0),          # top
+                     (kf_x - size, size)],  # left
                     fill="#00FF00", outline="#000000"
                 )
+            self._kf_strip_photo = ImageTk.PhotoImage(strip)
+            self._kf_strip_key = strip_key
+            self.itemconfigure(items['keyframes'], image=self._kf_strip_photo)
+        self.coords(items['keyframes'], 0, bar_y - 3 - size * 2)
         
     def _format_time(self, seconds):
         """Format seconds as MM:SS (wraps shared function)."""
@@ -449,33 +819,12 @@ class VideoSeekerCanvas(tk.Canvas):
     
     def _get_handle_at(self, x, y):
         """Check if x,y is on a crop handle. Returns handle name or None."""
-        current_crop = self.get_crop_for_frame(self.current_frame)
-        if not current_crop:
-            return None
-        
-        x1, y1, x2, y2 = current_crop
-        canvas_x1 = self.image_x + int(x1 * self.display_scale)
-        canvas_y1 = self.image_y + int(y1 * self.display_scale)
-        canvas_x2 = self.image_x + int(x2 * self.display_scale)
-        canvas_y2 = self.image_y + int(y2 * self.display_scale)
-        
         hs = self.handle_size + 4  # Hitbox slightly larger than visual
         
-        # Check corners
-        if abs(x - canvas_x1) <= hs and abs(y - canvas_y1) <= hs:
-            return 'tl'
-        if abs(x - canvas_x2) <= hs and abs(y - canvas_y1) <= hs:
-            return 'tr'
-        if abs(x - canvas_x1) <= hs and abs(y - canvas_y2) <= hs:
-            return 'bl'
-        if abs(x - canvas_x2) <= hs and abs(y - canvas_y2) <= hs:
-            return 'br'
-        
-        # Check center
-        cx = (canvas_x1 + canvas_x2) // 2
-        cy = (canvas_y1 + canvas_y2) // 2
-        if abs(x - cx) <= hs and abs(y - cy) <= hs:
-            return 'center'
+        # Handle centers as last laid out by _layout_overlay, corners first
+        for name, (hx, hy) in self._handle_points.items():
+            if abs(x - hx) <= hs and abs(y - hy) <= hs:
+                return name
         
         return None
     
@@ -498,9 +847,11 @@ class VideoSeekerCanvas(tk.Canvas):
                     self.start_frame = min(frame, self.end_frame - 1)
                     self.current_frame = self.start_frame
                 else:
-                    # Normal click = just seek (for setting keyframes)
+                    # Normal click = just seek (for setting keyframes);
+                    # dragging from here scrubs
                     self.current_frame = frame
-                self._update_display()
+                    self.scrubbing_timeline = True
+                self._request_redraw()
         elif self._is_on_video(event.x, event.y):
             # Click on video = start drawing new crop rectangle
             self.drawing_crop = True
@@ -552,33 +903,42 @@ class VideoSeekerCanvas(tk.Canvas):
             if y1 > y2:
                 y1, y2 = y2, y1
             
-            # Update pending crop (will become keyframe on release)
+            # Update pending crop (will become keyframe on release). The
+            # frame itself is unchanged, so only the overlay items move.
             self._pending_crop_rect = (x1, y1, x2, y2)
-            self._update_display()
+            self._layout_overlay()
+            
+        elif self.scrubbing_timeline:
+            # Scrubbing: the marker and labels follow the mouse right away,
+            # the frame follows as the decode worker catches up (frames it
+            # hasn't reached yet keep the last decoded image on screen)
+            frame = self._get_frame_from_x(event.x)
+            if frame is not None and frame != self.current_frame:
+                self.current_frame = frame
+                self._request_redraw()
             
         elif self.drawing_crop and self.crop_start_x is not None:
             # Drawing crop rectangle
-            if self.rect_id:
-                self.delete(self.rect_id)
-            self.rect_id = self.create_rectangle(
-                self.crop_start_x, self.crop_start_y, event.x, event.y,
-                outline="#00FF00", width=2
-            )
+            rect = self._items['rect']
+            self.coords(rect, self.crop_start_x, self.crop_start_y, event.x, event.y)
+            self.itemconfigure(rect, outline="#00FF00", state=tk.NORMAL)
     
     def on_left_release(self, event):
         """Handle left button release - finalize handle drag, crop, or timeline."""
         # Handle drag finished - auto-create keyframe
         if self.dragging_handle and self._pending_crop_rect:
             self.crop_keyframes[self.current_frame] = self._pending_crop_rect
+            self._keyframes_changed()
             self._pending_crop_rect = None
             self.dragging_handle = None
             self.drag_start_rect = None
-            self._update_display()
+            self._request_redraw()
             return
         
         self.dragging_handle = None
         self.drag_start_rect = None
         self.dragging_timeline_start = False
+        self.scrubbing_timeline = False
         
         if self.drawing_crop and self.crop_start_x is not None:
             self.drawing_crop = False
@@ -605,16 +965,14 @@ class VideoSeekerCanvas(tk.Canvas):
             if vid_x2 - vid_x1 > 10 and vid_y2 - vid_y1 > 10:
                 # Auto-create keyframe when drawing new crop
                 self.crop_keyframes[self.current_frame] = (vid_x1, vid_y1, vid_x2, vid_y2)
+                self._keyframes_changed()
                 self._pending_crop_rect = None
             else:
                 self._pending_crop_rect = None
-                if self.rect_id:
-                    self.delete(self.rect_id)
-                    self.rect_id = None
             
             self.crop_start_x = None
             self.crop_start_y = None
-            self._update_display()
+            self._request_redraw()
     
     def on_right_press(self, event):
         """Handle right button press - Ctrl+click sets end time."""
@@ -625,7 +983,7 @@ class VideoSeekerCanvas(tk.Canvas):
                 if event.state & 0x4:  # Ctrl key pressed
                     self.end_frame = max(frame, self.start_frame + 1)
                     self.current_frame = self.end_frame
-                    self._update_display()
+                    self._request_redraw()
     
     def on_right_drag(self, event):
         """Handle right button drag - no-op now."""
@@ -649,34 +1007,29 @@ class VideoSeekerCanvas(tk.Canvas):
     def reset_crop(self):
         """Clear the pending crop rectangle (not keyframes)."""
         self._pending_crop_rect = None
-        if self.rect_id:
-            self.delete(self.rect_id)
-            self.rect_id = None
-        self._update_display()
+        self._request_redraw()
     
     def clear_all_keyframes(self):
         """Clear all crop keyframes."""
         self.crop_keyframes = {}
+        self._keyframes_changed()
         self._pending_crop_rect = None
-        if self.rect_id:
-            self.delete(self.rect_id)
-            self.rect_id = None
-        self._update_display()
+        self._request_redraw()
         
     def set_start_at_current(self):
         """Set start point at current position."""
         self.start_frame = min(self.current_frame, self.end_frame - 1)
-        self._update_display()
+        self._request_redraw()
         
     def set_end_at_current(self):
         """Set end point at current position."""
         self.end_frame = max(self.current_frame, self.start_frame + 1)
-        self._update_display()
+        self._request_redraw()
         
     def seek_relative(self, frames):
         """Seek by a number of frames."""
         self.current_frame = max(0, min(self.current_frame + frames, self.total_frames - 1))
-        self._update_display()
+        self._request_redraw()
         
     def get_time_range(self):
         """Get the selected time range in seconds."""
@@ -697,16 +1050,39 @@ class VideoSeekerCanvas(tk.Canvas):
         if self.cap is None:
             return None
         
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-        ret, frame = self.cap.read()
+        return self._read_frame_rgb(frame_num)
+    
+    def _read_frame_rgb(self, frame_num):
+        """
+        Decode a frame into a reused BGR buffer and return it as an RGB PIL Image.
+        
+        The PIL Image owns a copy of the pixels, so the buffer can be
+        overwritten by the next read. PIL unpacks the BGR bytes directly
+        ("BGR" raw mode), skipping a separate cvtColor pass.
+        """
+        _advance_capture(self.cap, self._cap_next_frame, frame_num, self.MAX_GRAB_SKIP)
+        self._cap_next_frame = None
+        if not self.cap.grab():
+            return None
+        ret, self._frame_buf = self.cap.retrieve(self._frame_buf)
         if not ret:
             return None
+        self._cap_next_frame = frame_num + 1
         
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return Image.fromarray(frame_rgb)
+        height, width = self._frame_buf.shape[:2]
+        return Image.frombuffer("RGB", (width, height), self._frame_buf, "raw", "BGR", 0, 1)
     
-    def release(self):
-        """Release video resources."""
+    def release(self, wait=False):
+        """
+        Release video resources.
+        
+        The decode worker is only signalled to stop (it removes its proxy on
+        exit). Pass wait only once the Tk loop has ended: the worker posts
+        decoded frames with after(), which needs the Tk thread, so joining it
+        from a Tk callback can stall both threads.
+        """
+        self._stop_decode_worker(wait=wait)
+        self._handle_points = {}
         if self.cap:
             self.cap.release()
             self.cap = None
@@ -728,17 +1104,33 @@ class VideoSeekerCanvas(tk.Canvas):
         if frame_num in self.crop_keyframes:
             return self.crop_keyframes[frame_num]
         
-        # Interpolate from keyframes
+        # Interpolate from keyframes. Called several times per mouse event
+        # for the same frame, so the last result is kept.
         if self.crop_keyframes:
-            return interpolate_crop_keyframes(
-                self.crop_keyframes,
-                frame_num,
-                self.video_width,
-                self.video_height
-            )
+            if self._crop_cache is None or self._crop_cache[0] != frame_num:
+                crop = interpolate_crop_keyframes(
+                    self.crop_keyframes,
+                    frame_num,
+                    self.video_width,
+                    self.video_height,
+                    sorted_frames=self._sorted_keyframes()
+                )
+                self._crop_cache = (frame_num, crop)
+            return self._crop_cache[1]
         
         return None
     
+    def _sorted_keyframes(self):
+        """Keyframe frame numbers in order (cached until _keyframes_changed)."""
+        if self._kf_sorted is None:
+            self._kf_sorted = sorted(self.crop_keyframes)
+        return self._kf_sorted
+    
+    def _keyframes_changed(self):
+        """Drop state derived from crop_keyframes; call after every change to it."""
+        self._kf_sorted = None
+        self._crop_cache = None
+    
     @property
     def crop_rect(self):
         """Property for backwards compatibility - returns keyframes dict."""
@@ -761,7 +1153,8 @@ class VideoSeekerCanvas(tk.Canvas):
         else:
             self.crop_keyframes = {}
             self._pending_crop_rect = None
-        self._update_display()
+        self._keyframes_changed()
+        self._request_redraw()
     
     def add_keyframe(self):
         """
@@ -771,8 +1164,9 @@ class VideoSeekerCanvas(tk.Canvas):
         crop = self._pending_crop_rect or self.get_crop_for_frame(self.current_frame)
         if crop is not None:
             self.crop_keyframes[self.current_frame] = crop
+            self._keyframes_changed()
             self._pending_crop_rect = None
-            self._update_display()
+            self._request_redraw()
             return True
         return False
     
@@ -781,11 +1175,12 @@ class VideoSeekerCanvas(tk.Canvas):
         Remove the keyframe at the current frame.
         Returns True if keyframe was removed, False otherwise.
         """
-        if self.current_frame in self.crop_keyframes:
-            del self.crop_keyframes[self.current_frame]
-            self._update_display()
-            return True
-        return False
+        # Keyframe values are crop tuples, never None
+        if self.crop_keyframes.pop(self.current_frame, None) is None:
+            return False
+        self._keyframes_changed()
+        self._request_redraw()
+        return True
     
     def has_keyframe_at_current(self):
         """Check if there's a keyframe at the current frame."""
@@ -797,32 +1192,36 @@ class VideoSeekerCanvas(tk.Canvas):
     
     def go_to_next_keyframe(self):
         """Navigate to the next keyframe after current position."""
-        if not self.crop_keyframes:
-            return False
-        sorted_frames = sorted(self.crop_keyframes.keys())
-        for kf in sorted_frames:
-            if kf > self.current_frame:
-                self.current_frame = kf
-                self._update_display()
-                return True
+        sorted_frames = self._sorted_keyframes()
+        index = bisect.bisect_right(sorted_frames, self.current_frame)
+        if index < len(sorted_frames):
+            self.current_frame = sorted_frames[index]
+            self._request_redraw()
+            return True
         return False
     
     def go_to_prev_keyframe(self):
         """Navigate to the previous keyframe before current position."""
-        if not self.crop_keyframes:
-            return False
-        sorted_frames = sorted(self.crop_keyframes.keys(), reverse=True)
-        for kf in sorted_frames:
-            if kf < self.current_frame:
-                self.current_frame = kf
-                self._update_display()
-                return True
+        sorted_frames = self._sorted_keyframes()
+        index = bisect.bisect_left(sorted_frames, self.current_frame)
+        if index > 0:
+            self.current_frame = sorted_frames[index - 1]
+            self._request_redraw()
+            return True
         return False
 
 
 class MediaProcessorGUI:
     """Main GUI application for image and video processing."""
     
+    # File type filters for the single-file input dialog
+    INPUT_FILETYPES = (
+        ("Media files", "*.jpg *.jpeg *.png *.bmp *.tiff *.tif *.webp *.mp4 *.avi *.mov *.mkv *.webm"),
+        ("Image files", "*.jpg *.jpeg *.png *.bmp *.tiff *.tif *.webp"),
+        ("Video files", "*.mp4 *.avi *.mov *.mkv *.webm"),
+        ("All files", "*.*")
+    )
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Image & Video Processor")
@@ -843,6 +1242,7 @@ class MediaProcessorGUI:
         self.file_type_filter = tk.StringVar(value="all")  # "all", "images", "videos"
         self.file_type_filter = tk.StringVar(value="all")  # "all", "images", "videos"
         self.include_audio = tk.BooleanVar(value=True)  # Include audio in output video
+        self.hw_encode = tk.BooleanVar(value=True)  # Encode videos on the GPU if a hardware encoder works
         self.video_speed = tk.DoubleVar(value=1.0)  # Playback speed multiplier
         self.replace_original = tk.BooleanVar(value=False)  # Replace original file instead of saving to output folder
         
@@ -873,10 +1273,22 @@ class MediaProcessorGUI:
         
         # Persistence settings
         self.file_settings = {}  # {'path_str': {'crop': [...], 'time': [...]}}
+        self._current_path_str = None  # str(current_media_path), the file_settings key
+        
+        # Last processed image, so Preview followed by Confirm blurs once
+        self._result_cache = None  # (key, PIL Image), see _get_processed_image
         
         self.cancel_event = threading.Event()
         self._processing = False
         
+        # Confirmed images are blurred and saved in the background so the
+        # next file can be reviewed right away; _finish_processing waits
+        self._save_executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+        self._pending_saves = []
+        
+        # Progress of the running video job, drained by _drain_progress_q
+        self._progress_q = None
+        
         self._build_ui()
         self._check_ffmpeg()
         
@@ -991,6 +1403,9 @@ class MediaProcessorGUI:
         self.audio_checkbox = ttk.Checkbutton(left_panel, text="Include Audio", variable=self.include_audio)
         self.audio_checkbox.pack(anchor=tk.W, pady=(10, 0))
         
+        # Hardware encoding checkbox
+        ttk.Checkbutton(left_panel, text="Hardware Encoding (GPU)", variable=self.hw_encode).pack(anchor=tk.W)
+        
         # Playback Speed
         speed_frame = ttk.Frame(left_panel)
         speed_frame.pack(anchor=tk.W, pady=(5, 0))
@@ -1163,13 +1578,7 @@ For videos:
         if self.input_mode.get() == "folder":
             path = filedialog.askdirectory(title="Select Input Folder")
         else:
-            filetypes = [
-                ("Media files", "*.jpg *.jpeg *.png *.bmp *.tiff *.tif *.webp *.mp4 *.avi *.mov *.mkv *.webm"),
-                ("Image files", "*.jpg *.jpeg *.png *.bmp *.tiff *.tif *.webp"),
-                ("Video files", "*.mp4 *.avi *.mov *.mkv *.webm"),
-                ("All files", "*.*")
-            ]
-            path = filedialog.askopenfilename(title="Select Input File", filetypes=filetypes)
+            path = filedialog.askopenfilename(title="Select Input File", filetypes=self.INPUT_FILETYPES)
         
         if path:
             self.input_path.set(path)
@@ -1235,23 +1644,11 @@ For videos:
         
     def _get_media_files(self, folder):
         """Get all media files from a folder based on filter."""
-        filter_type = self.file_type_filter.get()
-        if filter_type == "images":
-            supported = IMAGE_EXTENSIONS
-        elif filter_type == "videos":
-            supported = VIDEO_EXTENSIONS
-        else:
-            supported = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
-        
-        files = []
-        for f in sorted(Path(folder).iterdir()):
-            if f.is_file() and f.suffix.lower() in supported:
-                files.append(f)
-        return files
+        return get_media_files(folder, self.file_type_filter.get())
         
     def _is_video(self, path):
         """Check if a file is a video."""
-        return Path(path).suffix.lower() in VIDEO_EXTENSIONS
+        return is_video(path)
         
     def _load_current_media(self):
         """Load the current media file."""
@@ -1260,6 +1657,7 @@ For videos:
             return
         
         media_path = self.media_files[self.current_index]
+        self._result_cache = None
         self.progress_label.configure(text=f"File {self.current_index + 1} of {len(self.media_files)}")
         self.media_info.configure(text=f"{media_path.name}")
         
@@ -1267,6 +1665,11 @@ For videos:
             self._load_video(media_path)
         else:
             self._load_image(media_path)
+        
+        # Open the next video while this file is being reviewed
+        next_index = self.current_index + 1
+        if next_index < len(self.media_files) and self._is_video(self.media_files[next_index]):
+            self.video_canvas.prefetch_video(self.media_files[next_index])
             
     def _load_image(self, image_path):
         """Load an image file."""
@@ -1301,11 +1704,11 @@ For videos:
 
             self.image_canvas.set_image(pil_image)
             self.current_media_path = image_path
+            self._current_path_str = str(image_path)
             
             # Restore settings if available
-            path_str = str(image_path)
-            if path_str in self.file_settings:
-                settings = self.file_settings[path_str]
+            settings = self.file_settings.get(self._current_path_str)
+            if settings:
                 if settings.get('crop'):
                     self.image_canvas.crop_rect = settings['crop']
                     self.image_canvas._update_display()
@@ -1321,6 +1724,7 @@ For videos:
         self.current_mode = "video_seek"
         self._show_video_canvas()
         self.current_media_path = video_path
+        self._current_path_str = str(video_path)
         self.current_video_times = None
         self.current_crop_rect = None
         
@@ -1331,9 +1735,8 @@ For videos:
             return
 
         # Restore settings if available
-        path_str = str(video_path)
-        if path_str in self.file_settings:
-            settings = self.file_settings[path_str]
+        settings = self.file_settings.get(self._current_path_str)
+        if settings:
             
             if settings.get('time'):
                 start_sec, end_sec = settings['time']
@@ -1410,7 +1813,7 @@ For videos:
         crop_rect = self.video_canvas.crop_rect
         
         # Save settings for this file
-        self.file_settings[str(self.current_media_path)] = {
+        self.file_settings[self._current_path_str] = {
             'crop': crop_rect,
             'time': self.current_video_times
         }
@@ -1427,12 +1830,12 @@ For videos:
     def _on_canvas_resize(self):
         """Handle image canvas resize."""
         if self.image_canvas.original_image:
-            self.image_canvas._update_display()
+            self.image_canvas._request_redraw()
             
     def _on_video_canvas_resize(self):
         """Handle video canvas resize."""
         if self.video_canvas.cap:
-            self.video_canvas._update_display()
+            self.video_canvas._request_redraw()
             
     def _reset_selection(self):
         """Reset the current crop selection."""
@@ -1454,7 +1857,7 @@ For videos:
             return
         self._processing = True
         # Save settings for this file
-        self.file_settings[str(self.current_media_path)] = {
+        self.file_settings[self._current_path_str] = {
             'crop': self.image_canvas.crop_rect
         }
 
@@ -1463,31 +1866,33 @@ For videos:
             self._process_animated_webp()
             return
 
-        cropped = self.image_canvas.get_cropped_image()
-        if cropped is None:
-            self._processing = False
-            return
+        # Reuse the preview's result if there is one, otherwise hand the crop
+        # to the save job; all Tk state is read here on the main thread
+        result = self._get_cached_result()
+        cropped = None
+        if result is None:
+            cropped = self.image_canvas.get_cropped_image()
+            if cropped is None:
+                self._processing = False
+                return
         
-        result = self._apply_processing(cropped)
-        
-        # Save
-        try:
-            if self.replace_original.get():
-                output_path = self.current_media_path
-                # Create a temp file first to avoid reading/writing same file issues if format changes or crash
-                temp_path = output_path.with_name(f"{output_path.stem}_temp{output_path.suffix}")
-                result.save(temp_path, quality=95)
-                # Replace original
-                os.replace(temp_path, output_path)
-            else:
-                output_path = Path(self.output_folder.get()) / f"{self.current_media_path.stem}_processed{self.current_media_path.suffix}"
-                result.save(output_path, quality=95)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save image:\n{e}")
-            self._processing = False
-            return
+        if self.replace_original.get():
+            output_path = self.current_media_path
+        else:
+            output_path = Path(self.output_folder.get()) / f"{self.current_media_path.stem}_processed{self.current_media_path.suffix}"
+        
+        future = self._save_executor.submit(
+            self._save_image_job,
+            result,
+            cropped,
+            self._get_target_dimensions(),
+            self.blur_radius.get(),
+            output_path,
+            self.replace_original.get()
+        )
+        future.add_done_callback(self._on_image_saved)
+        self._pending_saves.append(future)
 
-        self.processed_count += 1
         self.progress_bar["value"] = self.current_index + 1
 
         # Next file
@@ -1495,11 +1900,48 @@ For videos:
         self._processing = False
         self._load_current_media()
 
+    @staticmethod
+    def _save_image_job(result, cropped, target_size, blur_radius, output_path, replace):
+        """Process (unless already done) and save one image (runs in the save pool)."""
+        if result is None:
+            target_width, target_height = target_size
+            result = process_image_pil(
+                cropped,
+                target_width=target_width,
+                target_height=target_height,
+                blur_radius=blur_radius
+            )
+        if replace:
+            # Create a temp file first to avoid reading/writing same file issues if format changes or crash
+            temp_path = output_path.with_name(f"{output_path.stem}_temp{output_path.suffix}")
+            result.save(temp_path, quality=95)
+            # Replace original
+            os.replace(temp_path, output_path)
+        else:
+            result.save(output_path, quality=95)
+
+    def _on_image_saved(self, future):
+        """Report a failed background save (called from the save pool)."""
+        error = future.exception()
+        if error is not None:
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to save image:\n{error}"))
+
+    def _wait_for_pending_saves(self):
+        """Block until all background image saves finished; returns how many succeeded."""
+        if not self._pending_saves:
+            return 0
+        self.media_info.configure(text="Saving remaining images...")
+        self.root.update_idletasks()
+        concurrent.futures.wait(self._pending_saves)
+        saved = sum(1 for future in self._pending_saves if future.exception() is None)
+        self._pending_saves = []
+        return saved
+
     def _process_animated_webp(self):
         self._set_image_controls_state(False)
         self.cancel_event.clear()
         self.cancel_btn.configure(state=tk.NORMAL, text="Cancel Processing")
-        self.root.update()
+        self.root.update_idletasks()
 
         first_frame = self._anim_frames[0]
         crop_rect = self.image_canvas.crop_rect
@@ -1508,7 +1950,18 @@ For videos:
         blur_radius = self.blur_radius.get()
         output_folder = Path(self.output_folder.get()) if not self.replace_original.get() else None
 
+        # At most ~10 label updates per second; the first and last update of
+        # each stage always go through
+        last_update = {'time': 0.0, 'stage': None}
+
         def update_progress(current, total, stage="frames", **kwargs):
+            now = time.monotonic()
+            if (stage == last_update['stage'] and now - last_update['time'] < 0.1
+                    and current not in (0, total)):
+                return
+            last_update['time'] = now
+            last_update['stage'] = stage
+
             def do_update():
                 if stage == "frames":
                     percent = int((current / total) * 100) if total > 0 else 0
@@ -1581,20 +2034,28 @@ For videos:
             return (i, result)
 
         max_workers = min(os.cpu_count() or 4, total_frames)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(process_one, (i, f)) for i, f in enumerate(self._anim_frames)]
-
-            for idx, future in enumerate(concurrent.futures.as_completed(futures)):
-                i, result = future.result()
-                processed_frames[i] = result
-                if progress_callback:
-                    elapsed = time.time() - start_time
-                    done = idx + 1
-                    eta = (elapsed / done) * (total_frames - done) if done > 0 else 0
-                    progress_callback(done, total_frames, stage="frames", eta_seconds=eta)
-                pending = total_frames - (idx + 1)
-                active = min(max_workers, pending)
-                print(f"  [{idx+1}/{total_frames}] done, {pending} pending, ~{active} active workers")
+        
+        # One frame per core already; OpenCV's own threads inside each
+        # blur/resize would only oversubscribe the cores (see _export_video)
+        cv_threads = cv2.getNumThreads()
+        cv2.setNumThreads(1)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(process_one, (i, f)) for i, f in enumerate(self._anim_frames)]
+
+                for idx, future in enumerate(concurrent.futures.as_completed(futures)):
+                    i, result = future.result()
+                    processed_frames[i] = result
+                    if progress_callback:
+                        elapsed = time.time() - start_time
+                        done = idx + 1
+                        eta = (elapsed / done) * (total_frames - done) if done > 0 else 0
+                        progress_callback(done, total_frames, stage="frames", eta_seconds=eta)
+                    pending = total_frames - (idx + 1)
+                    active = min(max_workers, pending)
+                    print(f"  [{idx+1}/{total_frames}] done, {pending} pending, ~{active} active workers")
+        finally:
+            cv2.setNumThreads(cv_threads)
 
         if any(f is None for f in processed_frames):
             raise RuntimeError("Some frames failed to process")
@@ -1670,50 +2131,27 @@ For videos:
         self.cancel_event.clear()
         self.cancel_btn.configure(state=tk.NORMAL, text="Cancel Processing")
         
-        self.root.update()
+        self.root.update_idletasks()
+        
+        # The worker only queues its progress; a single Tk poller shows the
+        # newest entry, so a fast worker can never flood the event loop
+        progress_q = queue.Queue(maxsize=4)
+        self._progress_q = progress_q
         
-        # Progress callback to update GUI from background thread
         def update_progress(current, total, stage="frames", **kwargs):
-            def do_update():
-                if stage == "frames":
-                    percent = int((current / total) * 100) if total > 0 else 0
-                    
-                    # Build status text with timing info
-                    status_parts = [f"Processing: {percent}% ({current}/{total} frames)"]
-                    
-                    if 'ms_per_frame' in kwargs:
-                        ms = kwargs['ms_per_frame']
-                        status_parts.append(f"{ms:.0f}ms/frame")
-                    
-                    if 'eta_seconds' in kwargs:
-                        eta = kwargs['eta_seconds']
-                        if eta >= 60:
-                            eta_str = f"{int(eta // 60)}m {int(eta % 60)}s"
-                        else:
-                            eta_str = f"{int(eta)}s"
-                        status_parts.append(f"ETA: {eta_str}")
-                    
-                    self.media_info.configure(text=" | ".join(status_parts))
-                    
-                    # Update progress label with full timing breakdown
-                    if 'timing_breakdown' in kwargs:
-                        tb = kwargs['timing_breakdown']
-                        breakdown_parts = [
-                            f"R:{tb.get('read', 0)}%",
-                            f"Cr:{tb.get('crop', 0)}%",
-                            f"→PIL:{tb.get('convert_to_pil', 0)}%",
-                            f"Blur:{tb.get('process', 0)}%",
-                            f"→CV:{tb.get('convert_to_cv', 0)}%",
-                            f"W:{tb.get('write', 0)}%"
-                        ]
-                        self.progress_label.configure(text=" | ".join(breakdown_parts))
-                    
-                    self.progress_bar["maximum"] = total
-                    self.progress_bar["value"] = current
-                elif stage == "encoding":
-                    self.media_info.configure(text="Re-encoding with ffmpeg...")
-                    self.progress_label.configure(text="Adding audio and optimizing...")
-            self.root.after(0, do_update)
+            state = dict(kwargs, current=current, total=total, stage=stage)
+            while True:
+                try:
+                    progress_q.put_nowait(state)
+                    return
+                except queue.Full:
+                    # Drop the oldest update, the newest one supersedes it
+                    try:
+                        progress_q.get_nowait()
+                    except queue.Empty:
+                        pass
+        
+        self.root.after(50, self._drain_progress_q, progress_q)
         
         # Process in background thread
         def process():
@@ -1734,8 +2172,78 @@ For videos:
         thread = threading.Thread(target=process, daemon=True)
         thread.start()
         
+    def _drain_progress_q(self, progress_q):
+        """Show the newest queued video progress, then poll again in 50 ms."""
+        if progress_q is not self._progress_q:
+            return  # the job this poller belongs to has finished
+        
+        state = None
+        while True:
+            try:
+                state = progress_q.get_nowait()
+            except queue.Empty:
+                break
+        if state is not None:
+            self._show_video_progress(state)
+        
+        self.root.after(50, self._drain_progress_q, progress_q)
+        
+    def _show_video_progress(self, state):
+        """Update the status labels and progress bar from a progress entry."""
+        current = state['current']
+        total = state['total']
+        stage = state['stage']
+        if stage == "frames":
+            percent = int((current / total) * 100) if total > 0 else 0
+            
+            # Build status text with timing info
+            status_parts = [f"Processing: {percent}% ({current}/{total} frames)"]
+            
+            if 'ms_per_frame' in state:
+                ms = state['ms_per_frame']
+                status_parts.append(f"{ms:.0f}ms/frame")
+            
+            if 'eta_seconds' in state:
+                eta = state['eta_seconds']
+                if eta >= 60:
+                    eta_str = f"{int(eta // 60)}m {int(eta % 60)}s"
+                else:
+                    eta_str = f"{int(eta)}s"
+                status_parts.append(f"ETA: {eta_str}")
+            
+            self.media_info.configure(text=" | ".join(status_parts))
+            
+            # Update progress label with full timing breakdown
+            if 'timing_breakdown' in state:
+                tb = state['timing_breakdown']
+                breakdown_parts = [
+                    f"R:{tb.get('read', 0)}%",
+                    f"Blur:{tb.get('process', 0)}%",
+                    f"W:{tb.get('write', 0)}%"
+                ]
+                self.progress_label.configure(text=" | ".join(breakdown_parts))
+            
+            self.progress_bar["maximum"] = total
+            self.progress_bar["value"] = current
+        elif stage == "encoding":
+            self.media_info.configure(text="Re-encoding with ffmpeg...")
+            self.progress_label.configure(text="Adding audio and optimizing...")
+        
     def _process_video_file(self, video_path, crop_rect, time_range, progress_callback=None):
         """Process a video file (runs in background thread)."""
+        if self.hw_encode.get() and detect_hw_encoder():
+            try:
+                return self._export_video(video_path, crop_rect, time_range, progress_callback, hw_encode=True)
+            except subprocess.CalledProcessError as e:
+                # The encoder probe is one small frame; real encodes can still
+                # fail (e.g. NVENC size or session limits). The failed run
+                # removed its partial output, so export again in software
+                print(f"Hardware encode failed, falling back to CPU: {e.stderr}")
+                self.cancel_event.clear()  # set by the writer when ffmpeg exited
+        return self._export_video(video_path, crop_rect, time_range, progress_callback, hw_encode=False)
+        
+    def _export_video(self, video_path, crop_rect, time_range, progress_callback, hw_encode):
+        """Export one video through the frame pipeline into an ffmpeg encoder."""
         print(f"\n=== Starting video processing ===")
         print(f"Video: {video_path}")
         print(f"Crop keyframes: {crop_rect}")
@@ -1745,7 +2253,7 @@ For videos:
         blur_radius = self.blur_radius.get()
         print(f"Target: {target_width}x{target_height}, blur: {blur_radius}")
         
-        cap = cv2.VideoCapture(str(video_path))
+        cap = open_video_capture(str(video_path))
         if not cap.isOpened():
             print("ERROR: Could not open video!")
             return False
@@ -1772,20 +2280,42 @@ For videos:
         frames_to_process = int(input_frames_count / video_speed)
         print(f"Processing frames {start_frame} to {end_frame} ({input_frames_count} input -> {frames_to_process} output frames)")
         
-        # Create temp file
-        temp_dir = tempfile.mkdtemp()
-        temp_output = os.path.join(temp_dir, 'temp_video.mp4')
-        print(f"Temp output: {temp_output}")
+        # Output path
+        if self.replace_original.get():
+            # ffmpeg reads audio from the original while encoding, so write to a
+            # temp file next to it and replace the original afterwards
+            output_path = video_path.with_name(f"{video_path.stem}_processed_temp{video_path.suffix}")
+            is_replace = True
+        else:
+            output_path = Path(self.output_folder.get()) / f"{video_path.stem}_processed.mp4"
+            is_replace = False
+        
+        # Processed frames are piped straight into the final ffmpeg encode
+        include_audio = self.include_audio.get()
+        audio_offset = time_range[0] if time_range else 0
+        audio_duration = (time_range[1] - time_range[0]) if time_range else None
+        
+        encoder = start_ffmpeg_rawvideo_encode(
+            str(output_path),
+            target_width,
+            target_height,
+            fps,
+            audio_source=str(video_path) if include_audio else None,
+            audio_offset=audio_offset,
+            audio_duration=audio_duration,
+            include_audio=include_audio,
+            speed=video_speed,
+            hw_encode=hw_encode
+        )
+        print(f"Encoding to: {output_path}")
+        encoded = False
+        
+        # The frame pool already keeps every core busy; OpenCV's own worker
+        # threads inside each resize would only oversubscribe them
+        cv_threads = cv2.getNumThreads()
+        cv2.setNumThreads(1)
         
         try:
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(temp_output, fourcc, fps, (target_width, target_height))
-            
-            if not out.isOpened():
-                raise RuntimeError(f"Failed to create VideoWriter at {temp_output}")
-            
-            print(f"VideoWriter created successfully")
-            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
             
             # Timing accumulators
             import time
@@ -1800,8 +2330,11 @@ For videos:
             video_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             video_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             
+            # Keyframe order is fixed for the whole encode
+            keyframe_order = sorted(crop_rect) if isinstance(crop_rect, dict) else None
+            
             # Function to be executed in thread pool
-            def process_frame_task(frame_idx, actual_frame_num, frame):
+            def process_frame_task(frame_idx, actual_frame_num, frame, out):
                 # Determine crop for this frame
                 frame_crop = None
                 if crop_rect:
@@ -1811,7 +2344,8 @@ For videos:
                             crop_rect,
                             actual_frame_num,
                             video_width,
-                            video_height
+                            video_height,
+                            sorted_frames=keyframe_order
                         )
                     else:
                         # Legacy: single tuple crop
@@ -1824,40 +2358,43 @@ For videos:
                 else:
                     frame_cropped = frame
                 
-                # Convert to PIL for processing
-                frame_rgb = cv2.cvtColor(frame_cropped, cv2.COLOR_BGR2RGB)
-                pil_frame = Image.fromarray(frame_rgb)
-                
-                # Also convert original for background blur
-                original_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                pil_original = Image.fromarray(original_rgb)
-                
-                # Apply processing (blur + padding)
-                processed_pil = self._apply_processing(pil_frame, pil_original)
-                
-                # Convert back to OpenCV
-                processed_np = np.array(processed_pil)
-                processed_bgr = cv2.cvtColor(processed_np, cv2.COLOR_RGB2BGR)
-                
-                return processed_bgr
+                # Blur + padding straight on the BGR frame; the encoder takes bgr24,
+                # so no colour conversion or PIL round trip is needed
+                return compose_blur_padded(
+                    frame_cropped,
+                    frame,
+                    target_width,
+                    target_height,
+                    blur_radius,
+                    out=out
+                )
             
             # Queues for pipeline
             # Bounded read queue to control memory usage
             read_queue = queue.Queue(maxsize=16)
             write_queue = queue.Queue()
             
-            # Semaphore to bound the number of active futures (prevent OOM)
-            # Total frames in flight = read_queue items + semaphore count
+            # Frames being processed are bounded by a window of futures
+            # (prevent OOM); total in flight = read_queue items + window
             max_workers = os.cpu_count() or 4
-            submit_sem = threading.Semaphore(max_workers * 2)
+            window = max_workers * 2
+            
+            # Output frames are composed into a fixed set of reused buffers.
+            # The submit loop hands them out in frame order and the writer
+            # returns them once piped, which also bounds how many finished
+            # frames can wait for the writer
+            free_buffers = queue.Queue()
+            for _ in range(window + 2):
+                free_buffers.put(np.empty((target_height, target_width, 3), dtype=np.uint8))
             
             # Start Reader Thread
             def reader_thread():
                 print(f"Reader thread started (speed={video_speed}x)")
                 
-                # Setup seek
-                cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-                current_cap_pos = start_frame
+                # The capture is fresh (only its properties were read), so it
+                # is at frame 0; the first _advance_capture below moves it to
+                # start_frame, seeking only when that is far enough away
+                current_cap_pos = 0
                 
                 # Cache for slow motion (duplicating frames)
                 cached_frame = None
@@ -1879,13 +2416,9 @@ For videos:
                             except queue.Full: continue
                         continue
                     
-                    # Seek or Skip if needed
+                    # Skip (speed > 1) or seek to the target frame
                     if target_input_idx != current_cap_pos:
-                        diff = target_input_idx - current_cap_pos
-                        if 0 < diff < 50: # Efficient skip
-                            for _ in range(diff): cap.grab()
-                        elif diff != 0: # Seek
-                            cap.set(cv2.CAP_PROP_POS_FRAMES, target_input_idx)
+                        _advance_capture(cap, current_cap_pos, target_input_idx, VideoSeekerCanvas.MAX_GRAB_SKIP)
                         current_cap_pos = target_input_idx
                     
                     t0 = time.time()
@@ -1911,15 +2444,24 @@ For videos:
                         except queue.Full:
                             continue
                         
-                read_queue.put(None) # Sentinel
+                # Sentinel; once cancelled the submit loop stops on its own
+                # (it polls cancel_event), so nothing waits for this
+                while not self.cancel_event.is_set():
+                    try:
+                        read_queue.put(None, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
                 print("Reader thread finished")
 
             # Start Writer Thread
+            pipe_errors = []
+            
             def writer_thread():
                 print("Writer thread started")
                 next_write = 0
-                buffer = {}
                 
+                # Results arrive in frame order; None means the submit loop stopped
                 while next_write < frames_to_process:
                     if self.cancel_event.is_set(): break
                     
@@ -1927,41 +2469,44 @@ For videos:
                         item = write_queue.get(timeout=0.1)
                     except queue.Empty:
                         continue
+                    if item is None: break
                         
                     idx, result = item
-                    buffer[idx] = result
                     
-                    while next_write in buffer:
-                        if self.cancel_event.is_set(): break
+                    t0 = time.time()
+                    try:
+                        encoder.stdin.write(result)
+                    except OSError as e:
+                        # ffmpeg exited; stop the pipeline and report its error below
+                        pipe_errors.append(e)
+                        self.cancel_event.set()
+                        break
+                    timing_stats['write'] += time.time() - t0
+                    free_buffers.put(result)
+                    
+                    next_write += 1
+                    
+                    # Progress update
+                    if progress_callback and (next_write % 10 == 0):
+                        elapsed = time.time() - process_start_time
+                        ms_per_frame = (elapsed / next_write) * 1000
+                        remaining = frames_to_process - next_write
+                        eta = (remaining * elapsed / next_write) if next_write > 0 else 0
                         
-                        t0 = time.time()
-                        out.write(buffer[next_write])
-                        timing_stats['write'] += time.time() - t0
-                        del buffer[next_write]
+                        # Simple stats since we are decoupled
+                        total_time = sum(timing_stats.values())
+                        timing_breakdown = {}
+                        if total_time > 0:
+                            for step, step_time in timing_stats.items():
+                                timing_breakdown[step] = int((step_time / total_time) * 100)
                         
-                        next_write += 1
+                        progress_callback(
+                            next_write, frames_to_process, "frames",
+                            ms_per_frame=ms_per_frame,
+                            eta_seconds=eta,
+                            timing_breakdown=timing_breakdown
+                        )
                         
-                        # Progress update
-                        if progress_callback and (next_write % 10 == 0):
-                            elapsed = time.time() - process_start_time
-                            ms_per_frame = (elapsed / next_write) * 1000
-                            remaining = frames_to_process - next_write
-                            eta = (remaining * elapsed / next_write) if next_write > 0 else 0
-                            
-                            # Simple stats since we are decoupled
-                            total_time = sum(timing_stats.values())
-                            timing_breakdown = {}
-                            if total_time > 0:
-                                for step, step_time in timing_stats.items():
-                                    timing_breakdown[step] = int((step_time / total_time) * 100)
-                            
-                            progress_callback(
-                                next_write, frames_to_process, "frames",
-                                ms_per_frame=ms_per_frame,
-                                eta_seconds=eta,
-                                timing_breakdown=timing_breakdown
-                            )
-                            
                 print("Writer thread finished")
 
             t_read = threading.Thread(target=reader_thread, daemon=True)
@@ -1969,85 +2514,82 @@ For videos:
             t_read.start()
             t_write.start()
 
-            # Main Submit Loop
+            # Main Submit Loop: frames are submitted in order and collected
+            # oldest first, so results reach the writer in order and at most
+            # `window` frames are being processed at a time
             print(f"Starting execution pool with {max_workers} workers")
+            pending = deque()  # (idx, future), oldest first
+            
+            def collect_oldest():
+                f_idx, future = pending.popleft()
+                write_queue.put((f_idx, future.result()))
             
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                while True:
-                    if self.cancel_event.is_set(): break
-                    
-                    item = read_queue.get()
-                    if item is None: break
-                    
-                    idx, frame = item
-                    # Calculate input frame number for crop interpolation
-                    actual_frame_num = start_frame + int(idx * video_speed)
-                    
-                    # Wait for slot
-                    submit_sem.acquire()
-                    
-                    # Define closure safely
-                    def on_future_done(f, f_idx=idx):
+                try:
+                    while True:
+                        if self.cancel_event.is_set(): break
+                        
+                        # Poll, so a cancel (or a writer pipe error) is noticed
+                        # even while the reader is still decoding
                         try:
-                            res = f.result()
-                            write_queue.put((f_idx, res))
-                        except Exception as e:
-                            print(f"Task error frame {f_idx}: {e}")
-                            import traceback
-                            traceback.print_exc()
-                        finally:
-                            submit_sem.release()
-
-                    future = executor.submit(process_frame_task, idx, actual_frame_num, frame)
-                    future.add_done_callback(on_future_done)
-            
-            # Wait for threads
-            t_read.join()
-            t_write.join()
+                            item = read_queue.get(timeout=0.1)
+                        except queue.Empty:
+                            continue
+                        if item is None: break
+                        
+                        idx, frame = item
+                        # Calculate input frame number for crop interpolation
+                        actual_frame_num = start_frame + int(idx * video_speed)
+                        
+                        # Wait for slot
+                        if len(pending) >= window:
+                            collect_oldest()
+                        
+                        # Wait for a free output buffer
+                        out = None
+                        while out is None and not self.cancel_event.is_set():
+                            try:
+                                out = free_buffers.get(timeout=0.1)
+                            except queue.Empty:
+                                continue
+                        if out is None: break
+                        
+                        future = executor.submit(process_frame_task, idx, actual_frame_num, frame, out)
+                        pending.append((idx, future))
+                    
+                    while pending and not self.cancel_event.is_set():
+                        collect_oldest()
+                except Exception:
+                    # A frame failed: stop the reader and writer, then report it
+                    self.cancel_event.set()
+                    raise
+                finally:
+                    write_queue.put(None)
+                    # Wait for threads; the reader must be done with cap before
+                    # it is released
+                    t_read.join()
+                    t_write.join()
+            
+            if pipe_errors:
+                finish_ffmpeg_encode(encoder)
+                raise pipe_errors[0]
             
             if self.cancel_event.is_set():
                  raise InterruptedError("Processing cancelled")
-                
             
             cap.release()
-            out.release()
-            
-            # Output path
-            if self.replace_original.get():
-                # For video, we can't overwrite in place because ffmpeg might read from it (audio source)
-                # We already have a temp video `temp_output`.
-                # We need another temp for the final ffmpeg output if we are replacing.
-                # Actually run_ffmpeg_encode writes to a target.
-                # Let's write to a temp final file, then replace original.
-                output_path = video_path.with_name(f"{video_path.stem}_processed_temp{video_path.suffix}")
-                is_replace = True
-            else:
-                output_path = Path(self.output_folder.get()) / f"{video_path.stem}_processed.mp4"
-                is_replace = False
             
-            # Re-encode with ffmpeg (required for output)
+            # Wait for ffmpeg to flush the encode
             if progress_callback:
                 progress_callback(0, 0, "encoding")
             
-            include_audio = self.include_audio.get()
-            audio_offset = time_range[0] if time_range else 0
-            audio_duration = (time_range[1] - time_range[0]) if time_range else None
-            
-            run_ffmpeg_encode(
-                temp_output,
-                str(output_path),
-                audio_source=str(video_path) if include_audio else None,
-                audio_offset=audio_offset,
-                audio_duration=audio_duration,
-                include_audio=include_audio,
-                speed=video_speed
-            )
+            finish_ffmpeg_encode(encoder)
+            encoded = True
             
             if is_replace:
                 try:
                     # Overwrite original
-                    # If include_audio is True, ffmpeg read from video_path.
-                    # run_ffmpeg_encode finished, so handles should be closed.
+                    # ffmpeg has exited, so its handle on the audio source is closed.
                     os.replace(output_path, video_path)
                 except OSError as e:
                     print(f"Error replacing original file: {e}")
@@ -2060,10 +2602,23 @@ For videos:
             return True
             
         finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            cv2.setNumThreads(cv_threads)
+            cap.release()
+            if not encoded:
+                # Cancelled or failed: stop ffmpeg and drop the partial file
+                if encoder.poll() is None:
+                    encoder.kill()
+                    encoder.wait()
+                # (its stderr is closed by the thread draining it)
+                try:
+                    encoder.stdin.close()
+                except OSError:
+                    pass  # unflushed frames for the killed encoder
+                output_path.unlink(missing_ok=True)
                 
     def _on_video_processed(self, success):
         """Called when video processing completes."""
+        self._progress_q = None
         if success:
             self.processed_count += 1
         self.progress_bar["value"] = self.current_index + 1
@@ -2087,6 +2642,7 @@ For videos:
 
     def _on_video_error(self, error):
         """Called when video processing fails."""
+        self._progress_q = None
         is_cancelled = "cancelled" in str(error).lower()
         
         if is_cancelled:
@@ -2136,13 +2692,45 @@ For videos:
             background_image=background_image
         )
         
-    def _preview_result(self):
-        """Show a preview of the processed result."""
+    def _result_key(self):
+        """Key of the processed image for the current file, crop and output settings."""
+        crop_rect = self.image_canvas.crop_rect
+        return (
+            self._current_path_str,
+            tuple(crop_rect) if crop_rect else None,
+            self.blur_radius.get(),
+            self.resolution_var.get(),
+            self.aspect_ratio_var.get(),
+        )
+        
+    def _get_cached_result(self):
+        """The last processed image, if it still matches _result_key (else None)."""
+        if self._result_cache is not None and self._result_cache[0] == self._result_key():
+            return self._result_cache[1]
+        return None
+        
+    def _get_processed_image(self):
+        """
+        Crop and process the current image, reusing the last result if the
+        file, crop and output settings haven't changed since.
+        """
+        result = self._get_cached_result()
+        if result is not None:
+            return result
+        
         cropped = self.image_canvas.get_cropped_image()
         if cropped is None:
-            return
+            return None
         
         result = self._apply_processing(cropped)
+        self._result_cache = (self._result_key(), result)
+        return result
+        
+    def _preview_result(self):
+        """Show a preview of the processed result."""
+        result = self._get_processed_image()
+        if result is None:
+            return
         
         # Show in a new window
         preview_window = tk.Toplevel(self.root)
@@ -2186,9 +2774,9 @@ For videos:
         """Called when all files have been processed."""
         self._hide_webp_settings()
         # Cleanup last item
-        self.image_canvas.delete("all")
-        self.image_canvas.original_image = None
+        self.image_canvas.clear()
         self.video_canvas.release()
+        self.processed_count += self._wait_for_pending_saves()
         
         # Reset batch state
         self.current_index = 0
@@ -2226,6 +2814,8 @@ def main():
     
     app = MediaProcessorGUI(root)
     root.mainloop()
+    # Stops the seeker's decode worker and removes its scrub proxy
+    app.video_canvas.release(wait=True)
 
 
 if __name__ == "__main__":
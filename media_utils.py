@@ -5,12 +5,17 @@ Shared constants and utilities for image/video processing.
 Used by both image_processor.py (CLI) and image_processor_gui.py (GUI).
 """
 
+import bisect
+import collections
 import concurrent.futures
+import functools
 import io
+import math
 import os
 import subprocess
 import shutil
 import tempfile
+import threading
 import time
 from pathlib import Path
 from typing import Callable, Optional, Tuple, List, Set
@@ -32,6 +37,9 @@ DEFAULT_SCREEN_WIDTH = 1600
 DEFAULT_SCREEN_HEIGHT = 900
 MIN_CROP_SIZE = 10  # Minimum size for a valid crop rectangle
 
+# Videos larger than this are scrubbed through a low-res, short-GOP proxy
+PREVIEW_PROXY_MIN_BYTES = 100 * 1024 * 1024
+
 # Default processing settings
 DEFAULT_TARGET_WIDTH = 1920
 DEFAULT_TARGET_HEIGHT = 1080
@@ -45,6 +53,46 @@ FFMPEG_ENCODING_OPTS = {
     'audio_bitrate': '192k',
 }
 
+FFMPEG_NVENC_OPTS = {
+    'video_codec': 'h264_nvenc',
+    'preset': 'p4',
+    'rc': 'vbr',
+    'cq': '23',
+    'audio_codec': 'aac',
+    'audio_bitrate': '192k',
+}
+
+FFMPEG_QSV_OPTS = {
+    'video_codec': 'h264_qsv',
+    'preset': 'medium',
+    'global_quality': '23',
+    'audio_codec': 'aac',
+    'audio_bitrate': '192k',
+}
+
+FFMPEG_AMF_OPTS = {
+    'video_codec': 'h264_amf',
+    'quality': 'balanced',
+    'qp': '23',
+    'audio_codec': 'aac',
+    'audio_bitrate': '192k',
+}
+
+FFMPEG_VIDEOTOOLBOX_OPTS = {
+    'video_codec': 'h264_videotoolbox',
+    'q:v': '65',
+    'audio_codec': 'aac',
+    'audio_bitrate': '192k',
+}
+
+# Hardware encoders in order of preference (see detect_hw_encoder)
+FFMPEG_HW_ENCODING_OPTS = [
+    FFMPEG_NVENC_OPTS,
+    FFMPEG_QSV_OPTS,
+    FFMPEG_AMF_OPTS,
+    FFMPEG_VIDEOTOOLBOX_OPTS,
+]
+
 
 # =============================================================================
 # File Discovery
@@ -82,22 +130,27 @@ def get_media_files(
     else:
         extensions = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
     
-    files = []
-    for f in sorted(folder.iterdir()):
-        if f.is_file() and f.suffix.lower() in extensions:
-            files.append(f)
+    # scandir's entries carry the file type from the directory listing, so
+    # unlike Path.iterdir + is_file this needs no stat call per entry
+    # (except for symlinks), and Paths are only built for matches
+    with os.scandir(folder) as entries:
+        files = [
+            Path(entry.path) for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file()
+        ]
+    files.sort()
     
     return files
 
 
 def is_video(path) -> bool:
     """Check if a path is a video file."""
-    return Path(path).suffix.lower() in VIDEO_EXTENSIONS
+    return os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS
 
 
 def is_image(path) -> bool:
     """Check if a path is an image file."""
-    return Path(path).suffix.lower() in IMAGE_EXTENSIONS
+    return os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
 
 
 def get_video_properties(video_path: str) -> dict:
@@ -128,6 +181,34 @@ def get_video_properties(video_path: str) -> dict:
     return props
 
 
+def open_video_capture(video_path: str, hw_accel: bool = True) -> cv2.VideoCapture:
+    """
+    Open a video for decoding, using hardware decoding when available.
+    
+    With hw_accel, OpenCV's FFmpeg backend is asked for any hardware decoder
+    (NVDEC, VAAPI, D3D11, ...). It silently decodes in software if none
+    works, and a plain VideoCapture is used if the FFmpeg backend can't
+    open the file at all.
+    
+    Args:
+        video_path: Path to video file
+        hw_accel: Try hardware-accelerated decoding first
+    
+    Returns:
+        cv2.VideoCapture (check isOpened())
+    """
+    video_path = str(video_path)
+    if hw_accel and hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+        cap = cv2.VideoCapture(
+            video_path, cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        )
+        if cap.isOpened():
+            return cap
+        cap.release()
+    return cv2.VideoCapture(video_path)
+
+
 def normalize_rect(x1: int, y1: int, x2: int, y2: int) -> Tuple[int, int, int, int]:
     """
     Normalize a rectangle to ensure x1 <= x2 and y1 <= y2.
@@ -147,7 +228,8 @@ def interpolate_crop_keyframes(
     keyframes: dict,
     frame: int,
     video_width: int,
-    video_height: int
+    video_height: int,
+    sorted_frames: Optional[List[int]] = None
 ) -> Optional[Tuple[int, int, int, int]]:
     """
     Interpolate crop rect for a given frame from keyframes.
@@ -161,6 +243,8 @@ def interpolate_crop_keyframes(
         frame: Target frame number
         video_width: Width of video (for clamping)
         video_height: Height of video (for clamping)
+        sorted_frames: sorted(keyframes), if already known. Pass it when
+            interpolating many frames from the same keyframes.
     
     Returns:
         Interpolated crop rect (x1, y1, x2, y2), or None if no keyframes
@@ -168,7 +252,8 @@ def interpolate_crop_keyframes(
     if not keyframes:
         return None
     
-    sorted_frames = sorted(keyframes.keys())
+    if sorted_frames is None:
+        sorted_frames = sorted(keyframes.keys())
     
     # If only one keyframe, use it
     if len(sorted_frames) == 1:
@@ -182,20 +267,12 @@ def interpolate_crop_keyframes(
     if frame >= sorted_frames[-1]:
         return keyframes[sorted_frames[-1]]
     
-    # Find surrounding keyframes
-    prev_frame = sorted_frames[0]
-    next_frame = sorted_frames[-1]
-    
-    for kf in sorted_frames:
-        if kf <= frame:
-            prev_frame = kf
-        if kf >= frame and next_frame == sorted_frames[-1]:
-            next_frame = kf
-            break
-    
-    # Linear interpolation
-    if prev_frame == next_frame:
-        return keyframes[prev_frame]
+    # Find surrounding keyframes (binary search)
+    index = bisect.bisect_left(sorted_frames, frame)
+    next_frame = sorted_frames[index]
+    if next_frame == frame:
+        return keyframes[frame]
+    prev_frame = sorted_frames[index - 1]
     
     t = (frame - prev_frame) / (next_frame - prev_frame)
     
@@ -220,10 +297,14 @@ def interpolate_crop_keyframes(
 # FFmpeg Utilities
 # =============================================================================
 
+@functools.lru_cache(maxsize=1)
 def check_ffmpeg() -> bool:
     """
     Check if ffmpeg is available in the system PATH.
     
+    The result is cached for the lifetime of the process; call
+    check_ffmpeg.cache_clear() to look again (e.g. after PATH changes).
+    
     Returns:
         True if ffmpeg is available, False otherwise
     """
@@ -239,6 +320,135 @@ def check_ffmpeg() -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=1)
+def check_cuda_pipeline() -> bool:
+    """
+    Check if ffmpeg can run the CUDA blur-padding pipeline.
+    
+    Listing the encoders is not enough (most static builds include NVENC
+    even without an NVIDIA GPU), so a one-frame encode through
+    hwupload_cuda/scale_cuda/overlay_cuda/h264_nvenc is attempted.
+    The result is cached for the lifetime of the process.
+    
+    Returns:
+        True if the GPU pipeline works, False otherwise
+    """
+    cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-init_hw_device', 'cuda=gpu', '-filter_hw_device', 'gpu',
+        '-f', 'lavfi', '-i', 'color=black:s=256x256',
+        '-vf', 'format=yuv420p,split[a][b];[a]hwupload_cuda[m];'
+               '[b]hwupload_cuda,scale_cuda=128:128[o];[m][o]overlay_cuda',
+        '-frames:v', '1', '-c:v', FFMPEG_NVENC_OPTS['video_codec'], '-f', 'null', '-'
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            timeout=30,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        return result.returncode == 0
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def detect_hw_encoder() -> Optional[dict]:
+    """
+    Find a hardware H.264 encoder that works on this machine.
+    
+    The encoders of FFMPEG_HW_ENCODING_OPTS that this ffmpeg build lists
+    are tried in order with a one-frame test encode, because most builds
+    list NVENC/QSV/AMF whether or not the hardware is present. The test
+    uses the same codec and quality arguments as the real encodes, since
+    an encoder can exist but reject them.
+    The result is cached for the lifetime of the process.
+    
+    Returns:
+        The encoding options dict of the first working encoder, or None
+    """
+    creationflags = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+    try:
+        listed = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            creationflags=creationflags
+        ).stdout
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    
+    for opts in FFMPEG_HW_ENCODING_OPTS:
+        if f" {opts['video_codec']} " not in listed:
+            continue
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=black:s=256x256',
+            '-frames:v', '1', '-pix_fmt', 'yuv420p',
+            *_video_codec_args(opts), '-f', 'null', '-'
+        ]
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                timeout=30,
+                creationflags=creationflags
+            )
+        except subprocess.TimeoutExpired:
+            continue
+        if result.returncode == 0:
+            return opts
+    return None
+
+
+def start_preview_proxy(video_path: str, proxy_width: int) -> Tuple[subprocess.Popen, str]:
+    """
+    Start encoding a small, short-GOP copy of a video for scrubbing.
+    
+    Seeking in the source decodes from the previous keyframe at full
+    resolution; the proxy keeps every frame (so indices match) but has a
+    keyframe every 10 frames and is only proxy_width pixels wide.
+    
+    Args:
+        video_path: Source video
+        proxy_width: Width of the proxy (height keeps the aspect ratio)
+    
+    Returns:
+        (process, proxy_path); the proxy is usable once the process exits
+        with code 0. Clean up with stop_preview_proxy().
+    """
+    proxy_width = max(2, proxy_width // 2 * 2)
+    fd, proxy_path = tempfile.mkstemp(suffix='.mp4')
+    os.close(fd)
+    proc = subprocess.Popen(
+        [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-i', str(video_path), '-an',
+            '-vf', f'scale={proxy_width}:-2', '-fps_mode', 'passthrough',
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '28', '-g', '10',
+            proxy_path
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+    )
+    return proc, proxy_path
+
+
+def stop_preview_proxy(proc: Optional[subprocess.Popen], proxy_path: Optional[str]) -> None:
+    """Stop a proxy encode if it is still running and delete the proxy file."""
+    if proc is not None and proc.poll() is None:
+        proc.kill()
+        proc.wait()
+    if proxy_path is not None:
+        try:
+            os.remove(proxy_path)
+        except OSError:
+            pass
+
+
 def require_ffmpeg() -> None:
     """
     Ensure ffmpeg is available.
@@ -253,6 +463,123 @@ def require_ffmpeg() -> None:
         )
 
 
+def _video_codec_args(opts: dict) -> List[str]:
+    """Build the -c:v/-preset/quality arguments for an encoding options dict."""
+    args = ['-c:v', opts['video_codec']]
+    if 'preset' in opts:
+        args.extend(['-preset', opts['preset']])
+    if 'cq' in opts:
+        # NVENC: constant-quality VBR (-b:v 0 lets -cq drive the bitrate)
+        args.extend(['-rc', opts['rc'], '-cq', opts['cq'], '-b:v', '0'])
+    elif 'global_quality' in opts:
+        # QSV: ICQ rate control
+        args.extend(['-global_quality', opts['global_quality']])
+    elif 'qp' in opts:
+        # AMF: constant QP for I and P frames
+        args.extend(['-quality', opts['quality'], '-rc', 'cqp',
+                     '-qp_i', opts['qp'], '-qp_p', opts['qp']])
+    elif 'q:v' in opts:
+        # VideoToolbox: 1-100, higher is better
+        args.extend(['-q:v', opts['q:v']])
+    else:
+        args.extend(['-crf', opts['crf']])
+    return args
+
+
+@functools.lru_cache(maxsize=64)
+def _atempo_chain(speed: float) -> str:
+    """Build an atempo filter chain for the given speed multiplier (memoized)."""
+    # atempo filter supports 0.5 to 2.0
+    # Need to chain for larger/smaller values
+    filters = []
+    s = speed
+    while s > 2.0:
+        filters.append('atempo=2.0')
+        s /= 2.0
+    while s < 0.5:
+        filters.append('atempo=0.5')
+        s /= 0.5
+    filters.append(f'atempo={s}')
+    return ','.join(filters)
+
+
+def _ffmpeg_output_args(
+    output_path: str,
+    opts: dict,
+    audio_source: Optional[str],
+    audio_offset: float,
+    audio_duration: Optional[float],
+    include_audio: bool,
+    speed: float,
+    video_filter: Optional[str]
+) -> List[str]:
+    """
+    Build the ffmpeg arguments that follow the video input (-i): the optional
+    audio input, stream mapping, filters, codecs and the output path.
+    """
+    args = []
+    filter_args = ['-vf', video_filter] if video_filter else []
+    
+    if include_audio and audio_source:
+        # Add seeking/duration for audio source
+        if audio_offset > 0:
+            args.extend(['-ss', str(audio_offset)])
+        if audio_duration:
+            args.extend(['-t', str(audio_duration)])
+        
+        args.extend(['-i', audio_source])
+        args.extend(['-map', '0:v', '-map', '1:a?'])
+        
+        # Audio filter for speed
+        if abs(speed - 1.0) > 0.01:
+            args.extend(['-af', _atempo_chain(speed)])
+        
+        args.extend(filter_args)
+        args.extend(_video_codec_args(opts))
+        args.extend([
+            '-c:a', opts['audio_codec'],
+            '-b:a', opts['audio_bitrate'],
+            '-shortest',
+            '-movflags', '+faststart',
+            output_path
+        ])
+    else:
+        # No audio
+        args.extend(filter_args)
+        args.extend(_video_codec_args(opts))
+        args.extend([
+            '-an',
+            '-movflags', '+faststart',
+            output_path
+        ])
+    return args
+
+
+def _run_ffmpeg(cmd: List[str], tail_lines: int = 200) -> None:
+    """
+    Run an ffmpeg command to completion, keeping only the tail of its stderr.
+    
+    stderr is read line by line as it is produced, so a long encode never
+    buffers its whole log in memory.
+    
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails (stderr holds the tail)
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace',
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+    )
+    tail = collections.deque(proc.stderr, maxlen=tail_lines)
+    proc.stderr.close()
+    
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, None, ''.join(tail))
+
+
 def run_ffmpeg_encode(
     input_path: str,
     output_path: str,
@@ -260,19 +587,32 @@ def run_ffmpeg_encode(
     audio_offset: float = 0,
     audio_duration: Optional[float] = None,
     include_audio: bool = True,
-    speed: float = 1.0
+    speed: float = 1.0,
+    video_filter: Optional[str] = None,
+    input_offset: float = 0,
+    input_duration: Optional[float] = None,
+    use_cuda: bool = False,
+    hw_encode: bool = False
 ) -> None:
     """
     Re-encode a video file using ffmpeg.
     
     Args:
-        input_path: Path to processed video (no audio)
+        input_path: Path to input video (audio, if any, is taken from audio_source)
         output_path: Path for output file
         audio_source: Path to original video for audio extraction (optional)
         audio_offset: Seconds to skip in audio source
         audio_duration: Duration of audio to include (optional)
         include_audio: Whether to include audio from audio_source
         speed: Playback speed multiplier (0.5 to 100.0)
+        video_filter: Filtergraph applied to the video stream (-vf), optional
+        input_offset: Seconds to skip in input_path
+        input_duration: Duration of input_path to read (optional)
+        use_cuda: Decode with NVDEC and encode with NVENC; video_filter may
+                  then use CUDA filters (see build_blur_pad_filter_cuda)
+        hw_encode: Without use_cuda, decode and encode with whatever hardware
+                   detect_hw_encoder finds, else libx264; video_filter then
+                   runs on the CPU
     
     Raises:
         RuntimeError: If ffmpeg is not available
@@ -280,70 +620,198 @@ def run_ffmpeg_encode(
     """
     require_ffmpeg()
     
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error']
+    if use_cuda:
+        opts = FFMPEG_NVENC_OPTS
+        # One named device shared by every hwupload_cuda in the filtergraph
+        cmd.extend(['-init_hw_device', 'cuda=gpu', '-filter_hw_device', 'gpu', '-hwaccel', 'cuda'])
+    elif hw_encode and detect_hw_encoder():
+        opts = detect_hw_encoder()
+        # Decoded frames are downloaded to system memory for the CPU filters
+        cmd.extend(['-hwaccel', 'auto'])
+    else:
+        opts = FFMPEG_ENCODING_OPTS
+    
+    # Input seeking/trimming (placed before -i so ffmpeg seeks instead of decoding)
+    if input_offset > 0:
+        cmd.extend(['-ss', str(input_offset)])
+    if input_duration:
+        cmd.extend(['-t', str(input_duration)])
+    cmd.extend(['-i', input_path])
+    
+    cmd.extend(_ffmpeg_output_args(
+        output_path, opts, audio_source, audio_offset, audio_duration,
+        include_audio, speed, video_filter
+    ))
+    
+    _run_ffmpeg(cmd)
+
+
+def run_ffmpeg_encode_segments(
+    input_path: str,
+    output_path: str,
+    segments: List[Tuple[float, Optional[float], float]],
+    include_audio: bool = True,
+    video_filter: Optional[str] = None
+) -> None:
+    """
+    Trim, speed up and join several segments of a video in one ffmpeg pass.
+    
+    Each segment is cut with trim/atrim, retimed with setpts/atempo and the
+    results are joined with concat inside a single -filter_complex graph, so
+    N segments cost one ffmpeg process instead of N encodes plus a join.
+    
+    Args:
+        input_path: Path to input video
+        output_path: Path for output file
+        segments: (start, end, speed) tuples in seconds; end None means
+                  the end of the input
+        include_audio: Whether to include the input's audio (the input must
+                       then have an audio stream)
+        video_filter: Filtergraph applied to the joined video, optional
+    
+    Raises:
+        ValueError: If segments is empty
+        RuntimeError: If ffmpeg is not available
+        subprocess.CalledProcessError: If ffmpeg fails
+    """
+    if not segments:
+        raise ValueError("No segments to encode")
+    require_ffmpeg()
+    
     opts = FFMPEG_ENCODING_OPTS
     
-    if include_audio and audio_source:
-        # Build command with audio from source
-        cmd = ['ffmpeg', '-y', '-i', input_path]
-        
-        # Add seeking/duration for audio source
-        if audio_offset > 0:
-            cmd.extend(['-ss', str(audio_offset)])
-        if audio_duration:
-            cmd.extend(['-t', str(audio_duration)])
-        
-        cmd.extend(['-i', audio_source])
-        cmd.extend(['-map', '0:v', '-map', '1:a?'])
-        
-        # Audio filter for speed
-        af_filters = []
-        if abs(speed - 1.0) > 0.01:
-            # atempo filter supports 0.5 to 2.0
-            # Need to chain for larger/smaller values
-            s = speed
-            while s > 2.0:
-                af_filters.append('atempo=2.0')
-                s /= 2.0
-            while s < 0.5:
-                af_filters.append('atempo=0.5')
-                s /= 0.5
-            af_filters.append(f'atempo={s}')
-            
-            cmd.extend(['-af', ','.join(af_filters)])
-        
-        cmd.extend([
-            '-c:v', opts['video_codec'],
-            '-preset', opts['preset'],
-            '-crf', opts['crf'],
-            '-c:a', opts['audio_codec'],
-            '-b:a', opts['audio_bitrate'],
-            '-shortest',
-            '-movflags', '+faststart',
-            output_path
-        ])
+    graph = []
+    concat_inputs = []
+    for i, (start, end, speed) in enumerate(segments):
+        trim = f'start={start}' + (f':end={end}' if end is not None else '')
+        graph.append(f'[0:v]trim={trim},setpts=(PTS-STARTPTS)/{speed}[v{i}]')
+        concat_inputs.append(f'[v{i}]')
+        if include_audio:
+            atempo = f',{_atempo_chain(speed)}' if abs(speed - 1.0) > 0.01 else ''
+            graph.append(f'[0:a]atrim={trim},asetpts=PTS-STARTPTS{atempo}[a{i}]')
+            concat_inputs.append(f'[a{i}]')
+    
+    audio_streams = 1 if include_audio else 0
+    concat = f"{''.join(concat_inputs)}concat=n={len(segments)}:v=1:a={audio_streams}[cv]"
+    if include_audio:
+        concat += '[out_a]'
+    graph.append(concat)
+    graph.append(f"[cv]{video_filter or 'null'}[out_v]")
+    
+    cmd = [
+        'ffmpeg', '-y', '-loglevel', 'error', '-i', input_path,
+        '-filter_complex', ';'.join(graph),
+        '-map', '[out_v]'
+    ]
+    if include_audio:
+        cmd.extend(['-map', '[out_a]'])
+    cmd.extend(_video_codec_args(opts))
+    if include_audio:
+        cmd.extend(['-c:a', opts['audio_codec'], '-b:a', opts['audio_bitrate']])
     else:
-        # No audio
-        cmd = [
-            'ffmpeg', '-y', '-i', input_path,
-            '-c:v', opts['video_codec'],
-            '-preset', opts['preset'],
-            '-crf', opts['crf'],
-            '-an',
-            '-movflags', '+faststart',
-            output_path
-        ]
+        cmd.append('-an')
+    cmd.extend(['-movflags', '+faststart', output_path])
+    
+    _run_ffmpeg(cmd)
+
+
+def start_ffmpeg_rawvideo_encode(
+    output_path: str,
+    width: int,
+    height: int,
+    fps: float,
+    audio_source: Optional[str] = None,
+    audio_offset: float = 0,
+    audio_duration: Optional[float] = None,
+    include_audio: bool = True,
+    speed: float = 1.0,
+    hw_encode: bool = False
+) -> subprocess.Popen:
+    """
+    Start an ffmpeg encoder that reads raw BGR frames from stdin.
+    
+    Write each frame (a contiguous width x height x 3 uint8 array) to
+    proc.stdin, then call finish_ffmpeg_encode(proc). Audio is muxed from
+    audio_source in the same pass, so no intermediate video file is needed.
+    With hw_encode, the video is encoded on the GPU when a hardware encoder
+    works (see detect_hw_encoder), leaving the CPU to the frame processing.
+    The encoder probe is a single small frame, so a real encode can still
+    fail (size or session limits); callers should then retry without it.
     
-    result = subprocess.run(
+    Args:
+        output_path: Path for output file
+        width: Frame width
+        height: Frame height
+        fps: Output frame rate
+        audio_source: Path to original video for audio extraction (optional)
+        audio_offset: Seconds to skip in audio source
+        audio_duration: Duration of audio to include (optional)
+        include_audio: Whether to include audio from audio_source
+        speed: Playback speed multiplier, applied to the audio
+        hw_encode: Use a hardware encoder if one is detected, else libx264
+    
+    Returns:
+        The running ffmpeg process
+    
+    Raises:
+        RuntimeError: If ffmpeg is not available
+    """
+    require_ffmpeg()
+    
+    opts = (hw_encode and detect_hw_encoder()) or FFMPEG_ENCODING_OPTS
+    
+    cmd = [
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+        '-s', f'{width}x{height}', '-r', str(fps),
+        '-i', '-'
+    ]
+    cmd.extend(_ffmpeg_output_args(
+        output_path, opts, audio_source, audio_offset,
+        audio_duration, include_audio, speed, 'format=yuv420p'
+    ))
+    
+    proc = subprocess.Popen(
         cmd,
-        capture_output=True,
-        text=True,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
     )
     
-    if result.returncode != 0:
-        raise subprocess.CalledProcessError(
-            result.returncode, cmd, result.stdout, result.stderr
-        )
+    # stderr is drained while frames are written: if ffmpeg filled the pipe
+    # with errors it would block there, and the frame writer on stdin with it.
+    # Only the tail is kept (see _run_ffmpeg); the thread closes the pipe at EOF
+    proc.stderr_tail = collections.deque(maxlen=200)
+    
+    def drain_stderr():
+        with proc.stderr:
+            for line in proc.stderr:
+                proc.stderr_tail.append(line)
+    
+    proc.stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    proc.stderr_thread.start()
+    return proc
+
+
+def finish_ffmpeg_encode(proc: subprocess.Popen) -> None:
+    """
+    Close the stdin of an encoder from start_ffmpeg_rawvideo_encode and wait for it.
+    
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails (stderr holds the tail)
+    """
+    try:
+        proc.stdin.close()
+    except BrokenPipeError:
+        pass
+    proc.wait()
+    proc.stderr_thread.join()
+    
+    if proc.returncode != 0:
+        stderr = b''.join(proc.stderr_tail).decode(errors='replace')
+        raise subprocess.CalledProcessError(proc.returncode, proc.args, None, stderr)
 
 
 # =============================================================================
@@ -352,7 +820,11 @@ def run_ffmpeg_encode(
 
 def clamp(value: int, min_val: int, max_val: int) -> int:
     """Clamp a value to the given range."""
-    return max(min_val, min(value, max_val))
+    # Plain comparisons instead of min()/max(): no builtin calls or
+    # argument tuples, several times faster per point
+    if value > max_val:
+        value = max_val
+    return min_val if value < min_val else value
 
 
 def canvas_to_image_coords(
@@ -405,6 +877,44 @@ def image_to_canvas_coords(
     return canvas_x, canvas_y
 
 
+def canvas_to_image_coords_np(
+    points: np.ndarray,
+    image_offset: Tuple[int, int],
+    scale: float,
+    image_size: Tuple[int, int]
+) -> np.ndarray:
+    """
+    Convert an (N, 2) array of canvas coordinates to image coordinates.
+    
+    Array version of canvas_to_image_coords for polylines and other
+    multi-point input; truncates and clamps exactly like the scalar version.
+    
+    Returns:
+        (N, 2) int32 array in original image space, clamped to image bounds
+    """
+    out = ((np.asarray(points) - np.asarray(image_offset)) / scale).astype(np.int32)
+    np.clip(out, 0, np.asarray(image_size, dtype=np.int32), out=out)
+    return out
+
+
+def image_to_canvas_coords_np(
+    points: np.ndarray,
+    image_offset: Tuple[int, int],
+    scale: float
+) -> np.ndarray:
+    """
+    Convert an (N, 2) array of image coordinates to canvas coordinates.
+    
+    Array version of image_to_canvas_coords.
+    
+    Returns:
+        (N, 2) int32 array of canvas coordinates
+    """
+    out = (np.asarray(points) * scale).astype(np.int32)
+    out += np.asarray(image_offset, dtype=np.int32)
+    return out
+
+
 # =============================================================================
 # Time Formatting
 # =============================================================================
@@ -442,17 +952,13 @@ def parse_time_to_seconds(time_str: Optional[str]) -> Optional[float]:
     
     time_str = str(time_str).strip()
     
-    # Try parsing as float first (plain seconds)
-    try:
+    # Plain seconds
+    if ':' not in time_str:
         return float(time_str)
-    except ValueError:
-        pass
     
     # Parse HH:MM:SS or MM:SS format
     parts = time_str.split(':')
-    if len(parts) == 1:
-        return float(parts[0])
-    elif len(parts) == 2:
+    if len(parts) == 2:
         minutes, seconds = parts
         return int(minutes) * 60 + float(seconds)
     elif len(parts) == 3:
@@ -610,40 +1116,54 @@ def _save_animated_webp_pipe(
 # Image Processing
 # =============================================================================
 
-def process_image_pil(
-    pil_image: Image.Image,
+def _box_blur_size(kernel_size: int) -> int:
+    """
+    Box width whose three passes approximate GaussianBlur(kernel_size, sigma=0).
+    
+    Three box passes of width w have variance (w^2 - 1) / 4, matched here to the
+    sigma OpenCV derives from the kernel size; w is kept odd so the box is centered.
+    """
+    sigma = 0.3 * ((kernel_size - 1) * 0.5 - 1) + 0.8
+    width = int(round(math.sqrt(4 * sigma * sigma + 1)))
+    return width if width % 2 else width + 1
+
+
+def compose_blur_padded(
+    image: np.ndarray,
+    background_source: Optional[np.ndarray] = None,
     target_width: int = 1920,
     target_height: int = 1080,
     blur_radius: int = 10,
-    background_image: Optional[Image.Image] = None
-) -> Image.Image:
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
-    Process an image: scale to target height, add blurred background padding.
+    Fit an image into the target size over a blurred, cover-scaled background.
     
-    Uses OpenCV for fast Gaussian blur on downscaled image.
+    Works directly on arrays in either channel order (RGB or BGR), so callers
+    do not need to convert. Passing a reused out buffer avoids allocating a
+    new frame per call; the scaled image is resized straight into it.
     
     Args:
-        pil_image: The cropped/main image to process (RGB)
+        image: The cropped/main image (H x W x C uint8)
+        background_source: Optional uncropped image for the blurred background
+                           (uses image if None)
         target_width: Target output width
         target_height: Target output height
         blur_radius: Blur radius for background
-        background_image: Optional uncropped image for blurred background
-                         (uses pil_image if None)
+        out: Optional (target_height, target_width, C) uint8 array to write into
     
     Returns:
-        Processed PIL Image (RGB)
+        The composited image (out, if given)
     """
-    # Convert to numpy (RGB format)
-    img = np.array(pil_image).copy()
-    original_height, original_width = img.shape[:2]
+    original_height, original_width = image.shape[:2]
     
     # Get background source
-    if background_image is not None:
-        bg_source = np.array(background_image).copy()
-    else:
-        bg_source = img
+    bg_source = background_source if background_source is not None else image
     bg_source_h, bg_source_w = bg_source.shape[:2]
     
+    if out is None:
+        out = np.empty((target_height, target_width) + image.shape[2:], dtype=image.dtype)
+    
     # Calculate scaling factor to reach target size (Fit behavior)
     scale_h = target_height / original_height
     scale_w = target_width / original_width
@@ -652,9 +1172,6 @@ def process_image_pil(
     new_width = int(original_width * scale_factor)
     new_height = int(original_height * scale_factor)
     
-    # Scale the main (cropped) image
-    scaled_image = cv2.resize(img, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
-    
     # Need to create blurred background padding
     # Downscale significantly before blurring for performance
     bg_scale = max(target_width / bg_source_w, target_height / bg_source_h)
@@ -673,7 +1190,14 @@ def process_image_pil(
     small_radius = max(1, int(blur_radius / blur_downscale))
     kernel_size = small_radius * 2 + 1
     
-    if kernel_size > 1:
+    if kernel_size >= 7:
+        # Three box passes (running sums, cost independent of width) ~ Gaussian
+        box = (_box_blur_size(kernel_size),) * 2
+        for _ in range(3):
+            small_bg = cv2.blur(small_bg, box)
+    elif kernel_size > 1:
+        # Narrow kernels: the exact Gaussian is as fast and the box
+        # approximation is visibly off
         small_bg = cv2.GaussianBlur(small_bg, (kernel_size, kernel_size), 0)
     
     # Upscale back to full size
@@ -682,26 +1206,159 @@ def process_image_pil(
     # Center crop to exact target size
     crop_x = (final_bg_w - target_width) // 2
     crop_y = (final_bg_h - target_height) // 2
-    background = background[crop_y:crop_y + target_height, crop_x:crop_x + target_width].copy()
+    background = background[crop_y:crop_y + target_height, crop_x:crop_x + target_width]
     
     # Ensure exact size
     if background.shape[0] != target_height or background.shape[1] != target_width:
-        background = cv2.resize(background, (target_width, target_height), interpolation=cv2.INTER_LINEAR)
+        cv2.resize(background, (target_width, target_height), dst=out, interpolation=cv2.INTER_LINEAR)
+    else:
+        np.copyto(out, background)
     
-    # Paste scaled image centered on blurred background
-    result = background.copy()
+    # Scale the main (cropped) image straight into the centered region.
+    # INTER_AREA is both faster and alias-free when shrinking; Lanczos is
+    # only worth its cost when enlarging.
     paste_x = (target_width - new_width) // 2
     paste_y = (target_height - new_height) // 2
-    result[paste_y:paste_y + new_height, paste_x:paste_x + new_width] = scaled_image
+    cv2.resize(
+        image, (new_width, new_height),
+        dst=out[paste_y:paste_y + new_height, paste_x:paste_x + new_width],
+        interpolation=cv2.INTER_AREA if scale_factor < 1 else cv2.INTER_LANCZOS4
+    )
     
+    return out
+
+
+def process_image_pil(
+    pil_image: Image.Image,
+    target_width: int = 1920,
+    target_height: int = 1080,
+    blur_radius: int = 10,
+    background_image: Optional[Image.Image] = None
+) -> Image.Image:
+    """
+    Process an image: scale to target height, add blurred background padding.
+    
+    Uses OpenCV for fast Gaussian blur on downscaled image.
+    
+    Args:
+        pil_image: The cropped/main image to process (RGB)
+        target_width: Target output width
+        target_height: Target output height
+        blur_radius: Blur radius for background
+        background_image: Optional uncropped image for blurred background
+                         (uses pil_image if None)
+    
+    Returns:
+        Processed PIL Image (RGB)
+    """
+    img = np.asarray(pil_image)
+    bg_source = np.asarray(background_image) if background_image is not None else None
+    
+    result = compose_blur_padded(img, bg_source, target_width, target_height, blur_radius)
     return Image.fromarray(result)
 
 
+def build_blur_pad_filter(
+    target_width: int = 1920,
+    target_height: int = 1080,
+    blur_radius: int = 10,
+    crop_rect: Optional[Tuple[int, int, int, int]] = None
+) -> str:
+    """
+    Build an ffmpeg filtergraph equivalent to process_image_cv.
+    
+    The (optionally cropped) frame is scaled to fit the target size and
+    centered over a blurred, cover-scaled copy of itself.
+    
+    Args:
+        target_width: Target output width
+        target_height: Target output height
+        blur_radius: Blur radius for background
+        crop_rect: Tuple (x1, y1, x2, y2) for cropping, or None
+    
+    Returns:
+        Filtergraph string for use with ffmpeg's -vf option
+    """
+    filters = []
+    if crop_rect is not None:
+        x1, y1, x2, y2 = crop_rect
+        filters.append(f"crop={x2 - x1}:{y2 - y1}:{x1}:{y1},")
+    
+    # boxblur limits the radius to a quarter of the (4:2:0 chroma) frame size
+    radius = max(1, min(blur_radius, target_width // 4, target_height // 4))
+    
+    filters.append(
+        "split[fg][bg];"
+        f"[bg]scale={target_width}:{target_height}:force_original_aspect_ratio=increase,"
+        f"crop={target_width}:{target_height},boxblur={radius}[bgb];"
+        f"[fg]scale={target_width}:{target_height}:force_original_aspect_ratio=decrease[fgs];"
+        "[bgb][fgs]overlay=(W-w)/2:(H-h)/2,format=yuv420p"
+    )
+    return ''.join(filters)
+
+
+def build_blur_pad_filter_cuda(
+    source_width: int,
+    source_height: int,
+    target_width: int = 1920,
+    target_height: int = 1080,
+    blur_radius: int = 10,
+    crop_rect: Optional[Tuple[int, int, int, int]] = None
+) -> str:
+    """
+    Build the CUDA variant of build_blur_pad_filter.
+    
+    Use with run_ffmpeg_encode(use_cuda=True). The crop and the background
+    blur run on the CPU at low resolution before upload; the full-resolution
+    scaling and compositing run on the GPU (scale_cuda/overlay_cuda), so the
+    full-size frames only pass through the GPU and NVENC.
+    
+    Args:
+        source_width: Width of the input video
+        source_height: Height of the input video
+        target_width: Target output width
+        target_height: Target output height
+        blur_radius: Blur radius for background
+        crop_rect: Tuple (x1, y1, x2, y2) for cropping, or None
+    
+    Returns:
+        Filtergraph string for use with ffmpeg's -vf option
+    """
+    if crop_rect is not None:
+        x1, y1, x2, y2 = crop_rect
+        src_w, src_h = x2 - x1, y2 - y1
+        crop = f"crop={src_w}:{src_h}:{x1}:{y1},"
+    else:
+        src_w, src_h = source_width, source_height
+        crop = ""
+    
+    # Foreground fit size (even dimensions for 4:2:0 frames)
+    scale_factor = min(target_width / src_w, target_height / src_h)
+    fg_w = max(2, int(src_w * scale_factor) // 2 * 2)
+    fg_h = max(2, int(src_h * scale_factor) // 2 * 2)
+    
+    # Blur a small cover-scaled copy, GPU upscaling smooths it further
+    blur_downscale = 8 if blur_radius > 10 else 4
+    bg_w = max(2, target_width // blur_downscale // 2 * 2)
+    bg_h = max(2, target_height // blur_downscale // 2 * 2)
+    radius = max(1, min(blur_radius // blur_downscale, bg_w // 4, bg_h // 4))
+    
+    return (
+        f"{crop}format=yuv420p,split[fg][bg];"
+        f"[bg]scale={bg_w}:{bg_h}:force_original_aspect_ratio=increase,"
+        f"crop={bg_w}:{bg_h},boxblur={radius},hwupload_cuda,"
+        f"scale_cuda={target_width}:{target_height}:interp_algo=bicubic[bgb];"
+        f"[fg]hwupload_cuda,scale_cuda={fg_w}:{fg_h}:interp_algo=lanczos[fgs];"
+        f"[bgb][fgs]overlay_cuda=x={(target_width - fg_w) // 2}:y={(target_height - fg_h) // 2}"
+    )
+
+
 def process_image_cv(
     image: np.ndarray,
     target_width: int = 1920,
     target_height: int = 1080,
-    blur_radius: int = 10
+    blur_radius: int = 10,
+    out: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Process an OpenCV image (BGR): scale to target height, add blurred padding.
@@ -711,17 +1368,10 @@ def process_image_cv(
         target_width: Target output width
         target_height: Target output height
         blur_radius: Blur radius for background
+        out: Optional (target_height, target_width, 3) uint8 buffer to reuse
     
     Returns:
         Processed OpenCV image (BGR)
     """
-    # Convert BGR to RGB for processing
-    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    pil_image = Image.fromarray(image_rgb)
-    
-    # Process
-    result_pil = process_image_pil(pil_image, target_width, target_height, blur_radius)
-    
-    # Convert back to BGR
-    result_array = np.array(result_pil)
-    return cv2.cvtColor(result_array, cv2.COLOR_RGB2BGR)
+    # Resize and blur are per-channel, so BGR is processed as-is
+    return compose_blur_padded(image, None, target_width, target_height, blur_radius, out=out)
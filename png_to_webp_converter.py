@@ -2,24 +2,141 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
 from PIL import Image
+import concurrent.futures
+import os
+import queue
 import threading
 
 
+SOURCE_EXTENSIONS = {'.png', '.gif'}
+
+
+def _scan_dir(path):
+    """
+    List one directory: (subdirectory paths, PNG/GIF file Paths).
+    
+    Symlinked directories are not followed and unreadable directories are
+    skipped, as os.walk does by default.
+    """
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in SOURCE_EXTENSIONS and entry.is_file():
+                    files.append(Path(entry.path))
+    except OSError:
+        pass
+    return dirs, files
+
+
+def find_images(folder, recursive):
+    """
+    List the PNG/GIF files in folder (and its subfolders if recursive).
+    
+    One directory walk with a case-insensitive extension check, instead of
+    one glob per spelling of each extension. Subfolders are listed level by
+    level, each level in parallel threads: on network shares every listing
+    is a round trip, and the threads overlap them.
+    """
+    if not recursive:
+        return sorted(_scan_dir(folder)[1])
+    
+    images = []
+    level = [os.fspath(folder)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+        while level:
+            next_level = []
+            for dirs, files in executor.map(_scan_dir, level):
+                next_level.extend(dirs)
+                images.extend(files)
+            level = next_level
+    return sorted(images)
+
+
+def convert_one(image_file, quality, method, skip_existing, delete_original):
+    """
+    Convert one PNG/GIF file to WebP next to it.
+    
+    Runs in a worker process, so it only takes the path and plain options.
+    method is the libwebp effort (0-6) for static images; animated GIFs
+    always use 6. Returns (status, messages) where status is "converted",
+    "skipped" or "failed" and messages are the log lines for this file.
+    """
+    try:
+        # Create output path with .webp extension
+        webp_file = image_file.with_suffix('.webp')
+        
+        # Skip if WebP already exists and skip_existing is enabled
+        if skip_existing and webp_file.exists():
+            return "skipped", [f"⊘ Skipped: {image_file.name} (WebP already exists)"]
+        
+        # Open and convert image
+        with Image.open(image_file) as img:
+            # Handle animated GIFs
+            if image_file.suffix.lower() == '.gif' and getattr(img, 'is_animated', False):
+                # Save as animated WebP with better compression. Only the frame
+                # durations are collected up front; save_all then seeks
+                # through the GIF itself and converts one frame at a time
+                # (palette frames to RGB/RGBA), so no decoded frame list is kept
+                durations = []
+                for index in range(img.n_frames):
+                    img.seek(index)
+                    durations.append(img.info.get('duration', 100))
+                
+                img.save(
+                    webp_file, 
+                    'WEBP', 
+                    save_all=True, 
+                    duration=durations,
+                    loop=img.info.get('loop', 0),
+                    quality=quality,
+                    method=6,
+                    lossless=False,
+                    minimize_size=True
+                )
+            else:
+                # Static image conversion
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    # Keep alpha channel for WebP
+                    img.save(webp_file, 'WEBP', quality=quality, method=method)
+                else:
+                    img.save(webp_file, 'WEBP', quality=quality, method=method)
+        
+        messages = [f"✓ Converted: {image_file.name} -> {webp_file.name}"]
+        
+        # Delete original if checkbox is checked
+        if delete_original:
+            image_file.unlink()
+            messages.append(f"  Deleted: {image_file.name}")
+        
+        return "converted", messages
+        
+    except Exception as e:
+        return "failed", [f"✗ Failed: {image_file.name} - {str(e)}"]
+
+
 class PNGtoWebPConverter:
     def __init__(self, root):
         self.root = root
         self.root.title("PNG/GIF to WebP Converter")
-        self.root.geometry("650x600")
+        self.root.geometry("650x640")
         self.root.resizable(False, False)
         
         # Variables
         self.folder_path = tk.StringVar()
         self.quality = tk.IntVar(value=90)
+        self.method = tk.IntVar(value=4)
         self.delete_original = tk.BooleanVar(value=False)
         self.recursive = tk.BooleanVar(value=True)
         self.skip_existing = tk.BooleanVar(value=True)
         self.is_converting = False
         
+        # Written by the conversion thread, shown by _flush_log on the Tk thread
+        self._log_q = queue.Queue()
+        self._progress = None  # (value, maximum, label text)
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -51,40 +168,45 @@ class PNGtoWebPConverter:
         quality_label = ttk.Label(quality_frame, textvariable=self.quality, width=3)
         quality_label.pack(side=tk.LEFT)
         
+        # Encoder effort: 6 is only slightly smaller than 4 but several times slower
+        ttk.Label(main_frame, text="Method (0-6):").grid(row=3, column=0, sticky=tk.W, pady=5)
+        ttk.Spinbox(main_frame, from_=0, to=6, textvariable=self.method,
+                    width=5).grid(row=3, column=1, sticky=tk.W, padx=5, pady=5)
+        
         # Recursive checkbox
         recursive_check = ttk.Checkbutton(main_frame, text="Include subfolders (recursive)",
                                          variable=self.recursive)
-        recursive_check.grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=5)
+        recursive_check.grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=5)
         
         # Skip existing checkbox
         skip_check = ttk.Checkbutton(main_frame, text="Skip files that already have a WebP version",
                                      variable=self.skip_existing)
-        skip_check.grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=5)
+        skip_check.grid(row=5, column=0, columnspan=3, sticky=tk.W, pady=5)
         
         # Delete original checkbox
         delete_check = ttk.Checkbutton(main_frame, text="Delete original PNG/GIF files after conversion",
                                       variable=self.delete_original)
-        delete_check.grid(row=5, column=0, columnspan=3, sticky=tk.W, pady=5)
+        delete_check.grid(row=6, column=0, columnspan=3, sticky=tk.W, pady=5)
         
         # Progress bar
         self.progress_label = ttk.Label(main_frame, text="Ready to convert")
-        self.progress_label.grid(row=6, column=0, columnspan=3, pady=(20, 5))
+        self.progress_label.grid(row=7, column=0, columnspan=3, pady=(20, 5))
         
         self.progress_bar = ttk.Progressbar(main_frame, mode='determinate', length=500)
-        self.progress_bar.grid(row=7, column=0, columnspan=3, pady=5)
+        self.progress_bar.grid(row=8, column=0, columnspan=3, pady=5)
         
         # Status text
         self.status_text = tk.Text(main_frame, height=10, width=70, state='disabled')
-        self.status_text.grid(row=8, column=0, columnspan=3, pady=10)
+        self.status_text.grid(row=9, column=0, columnspan=3, pady=10)
         
         # Scrollbar for status text
         scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.status_text.yview)
-        scrollbar.grid(row=8, column=3, sticky=(tk.N, tk.S))
+        scrollbar.grid(row=9, column=3, sticky=(tk.N, tk.S))
         self.status_text.config(yscrollcommand=scrollbar.set)
         
         # Convert button
         self.convert_btn = ttk.Button(main_frame, text="Convert", command=self.start_conversion)
-        self.convert_btn.grid(row=9, column=0, columnspan=3, pady=10)
+        self.convert_btn.grid(row=10, column=0, columnspan=3, pady=10)
     
     def browse_folder(self):
         folder = filedialog.askdirectory(title="Select folder containing PNG/GIF files")
@@ -92,13 +214,47 @@ class PNGtoWebPConverter:
             self.folder_path.set(folder)
     
     def log_status(self, message):
-        self.status_text.config(state='normal')
-        self.status_text.insert(tk.END, message + "\n")
-        self.status_text.see(tk.END)
-        self.status_text.config(state='disabled')
-        self.root.update_idletasks()
+        # Queued rather than inserted: _flush_log writes the lines in batches
+        self._log_q.put(message)
+    
+    def _flush_log(self):
+        """Show queued log lines and the latest progress, then poll again in 100 ms."""
+        # The conversion thread clears is_converting after queuing its last
+        # line, so reading the flag before draining means a pass that sees it
+        # cleared also shows everything the thread queued
+        finished = not self.is_converting
+        
+        lines = []
+        while True:
+            try:
+                lines.append(self._log_q.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            self.status_text.config(state='normal')
+            self.status_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.status_text.see(tk.END)
+            self.status_text.config(state='disabled')
+        
+        progress = self._progress
+        if progress is not None:
+            value, maximum, text = progress
+            self.progress_bar['maximum'] = maximum
+            self.progress_bar['value'] = value
+            self.progress_label.config(text=text)
+        
+        if not finished:
+            self.root.after(100, self._flush_log)
+    
+    def convert_images(self, options):
+        try:
+            self._convert_images(options)
+        finally:
+            # Also after an unexpected error, so the button is usable again
+            self.is_converting = False
+            self.convert_btn.config(state='normal')
     
-    def convert_images(self):
+    def _convert_images(self, options):
         folder = Path(self.folder_path.get())
         
         if not folder.exists():
@@ -106,12 +262,7 @@ class PNGtoWebPConverter:
             return
         
         # Find all PNG and GIF files (recursive or current folder only)
-        if self.recursive.get():
-            image_files = (list(folder.rglob("*.png")) + list(folder.rglob("*.PNG")) +
-                          list(folder.rglob("*.gif")) + list(folder.rglob("*.GIF")))
-        else:
-            image_files = (list(folder.glob("*.png")) + list(folder.glob("*.PNG")) +
-                          list(folder.glob("*.gif")) + list(folder.glob("*.GIF")))
+        image_files = find_images(folder, self.recursive.get())
         
         if not image_files:
             messagebox.showinfo("Info", "No PNG or GIF files found in the selected folder!")
@@ -119,82 +270,35 @@ class PNGtoWebPConverter:
             return
         
         self.log_status(f"Found {len(image_files)} image file(s)")
-        self.progress_bar['maximum'] = len(image_files)
-        self.progress_bar['value'] = 0
+        self._progress = (0, len(image_files), "Converting...")
         
-        converted_count = 0
-        failed_count = 0
-        skipped_count = 0
+        counts = {"converted": 0, "skipped": 0, "failed": 0}
         
-        for i, image_file in enumerate(image_files):
-            try:
-                # Create output path with .webp extension
-                webp_file = image_file.with_suffix('.webp')
-                
-                # Skip if WebP already exists and skip_existing is enabled
-                if self.skip_existing.get() and webp_file.exists():
-                    self.log_status(f"⊘ Skipped: {image_file.name} (WebP already exists)")
-                    skipped_count += 1
-                    self.progress_bar['value'] = i + 1
-                    self.progress_label.config(text=f"Converting... {i + 1}/{len(image_files)}")
-                    self.root.update_idletasks()
-                    continue
-                
-                # Open and convert image
-                with Image.open(image_file) as img:
-                    # Handle animated GIFs
-                    if image_file.suffix.lower() == '.gif' and getattr(img, 'is_animated', False):
-                        # Save as animated WebP with better compression
-                        frames = []
-                        durations = []
-                        try:
-                            while True:
-                                # Convert to RGB/RGBA for better WebP compression
-                                frame = img.copy()
-                                if frame.mode == 'P':
-                                    frame = frame.convert('RGBA')
-                                frames.append(frame)
-                                durations.append(img.info.get('duration', 100))
-                                img.seek(img.tell() + 1)
-                        except EOFError:
-                            pass
-                        
-                        frames[0].save(
-                            webp_file, 
-                            'WEBP', 
-                            save_all=True, 
-                            append_images=frames[1:],
-                            duration=durations,
-                            loop=img.info.get('loop', 0),
-                            quality=self.quality.get(),
-                            method=6,
-                            lossless=False,
-                            minimize_size=True
-                        )
-                    else:
-                        # Static image conversion
-                        if img.mode in ('RGBA', 'LA', 'P'):
-                            # Keep alpha channel for WebP
-                            img.save(webp_file, 'WEBP', quality=self.quality.get(), method=6)
-                        else:
-                            img.save(webp_file, 'WEBP', quality=self.quality.get(), method=6)
-                
-                self.log_status(f"✓ Converted: {image_file.name} -> {webp_file.name}")
-                converted_count += 1
-                
-                # Delete original if checkbox is checked
-                if self.delete_original.get():
-                    image_file.unlink()
-                    self.log_status(f"  Deleted: {image_file.name}")
-                
-            except Exception as e:
-                self.log_status(f"✗ Failed: {image_file.name} - {str(e)}")
-                failed_count += 1
+        # Files are independent and WebP encoding is CPU-bound, so convert
+        # them in parallel worker processes (options were read by start_conversion)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {executor.submit(convert_one, image_file, *options): image_file
+                       for image_file in image_files}
             
-            # Update progress
-            self.progress_bar['value'] = i + 1
-            self.progress_label.config(text=f"Converting... {i + 1}/{len(image_files)}")
-            self.root.update_idletasks()
+            for i, future in enumerate(concurrent.futures.as_completed(futures)):
+                try:
+                    status, messages = future.result()
+                except concurrent.futures.BrokenExecutor:
+                    # A worker died (e.g. killed for memory); convert_one's own
+                    # error handling never ran, and every file still pending
+                    # in the pool ends up here
+                    status = "failed"
+                    messages = [f"✗ Failed: {futures[future].name} - worker process died"]
+                counts[status] += 1
+                for message in messages:
+                    self.log_status(message)
+                
+                # Update progress (shown by _flush_log)
+                self._progress = (i + 1, len(image_files), f"Converting... {i + 1}/{len(image_files)}")
+        
+        converted_count = counts["converted"]
+        skipped_count = counts["skipped"]
+        failed_count = counts["failed"]
         
         # Final summary
         self.log_status("\n" + "="*50)
@@ -202,16 +306,13 @@ class PNGtoWebPConverter:
         self.log_status(f"Successfully converted: {converted_count}")
         self.log_status(f"Skipped: {skipped_count}")
         self.log_status(f"Failed: {failed_count}")
-        self.progress_label.config(text="Conversion complete!")
+        self._progress = (len(image_files), len(image_files), "Conversion complete!")
         
         messagebox.showinfo("Complete", 
                           f"Conversion complete!\n\n"
                           f"Converted: {converted_count}\n"
                           f"Skipped: {skipped_count}\n"
                           f"Failed: {failed_count}")
-        
-        self.is_converting = False
-        self.convert_btn.config(state='normal')
     
     def start_conversion(self):
         if not self.folder_path.get():
@@ -221,14 +322,27 @@ class PNGtoWebPConverter:
         if self.is_converting:
             return
         
+        # The Spinbox accepts typed text, so check it here on the Tk thread;
+        # an out-of-range method would make every file fail
+        try:
+            method = self.method.get()
+        except tk.TclError:
+            method = None
+        if method not in range(7):
+            messagebox.showerror("Error", "Method must be a whole number from 0 to 6!")
+            return
+        options = (self.quality.get(), method, self.skip_existing.get(), self.delete_original.get())
+        
         self.is_converting = True
         self.convert_btn.config(state='disabled')
         self.status_text.config(state='normal')
         self.status_text.delete(1.0, tk.END)
         self.status_text.config(state='disabled')
+        self._progress = None
+        self.root.after(100, self._flush_log)
         
         # Run conversion in a separate thread to keep UI responsive
-        thread = threading.Thread(target=self.convert_images, daemon=True)
+        thread = threading.Thread(target=self.convert_images, args=(options,), daemon=True)
         thread.start()
 
 
@@ -0,0 +1,49 @@
+"""
+Tests for the CLI crop window's frame rendering (image_processor.ImageCropper).
+
+The OpenCL (UMat) and ndarray redraws must produce the same pixels. UMat
+works without an OpenCL device too (OpenCV then runs it on the CPU), so the
+UMat path is exercised here regardless of the machine.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from image_processor import ImageCropper  # noqa: E402
+
+
+class RenderDisplayTests(unittest.TestCase):
+
+    def setUp(self):
+        image = np.random.default_rng(0).integers(0, 256, (300, 700, 3), dtype=np.uint8)
+        self.cropper = ImageCropper(image)
+        self.cropper._init_umat()
+
+    def assert_paths_match(self):
+        expected = self.cropper._render_display().copy()
+        actual = self.cropper._render_display_umat().get()
+        np.testing.assert_array_equal(actual, expected)
+
+    def test_no_selection(self):
+        self.assert_paths_match()
+
+    def test_selections(self):
+        cases = [
+            ((50, 60), (400, 250)),
+            ((650, 290), (20, 10)),   # dragged up and to the left
+            ((0, 0), (700, 300)),     # whole image, no darkened band
+            ((-5, -5), (800, 400)),   # beyond the image edges
+        ]
+        for start, end in cases:
+            with self.subTest(start=start, end=end):
+                self.cropper.start_point, self.cropper.end_point = start, end
+                self.assert_paths_match()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+"""
+Tests for the shared helpers in media_utils.
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import media_utils  # noqa: E402
+
+
+class DetectHwEncoderTests(unittest.TestCase):
+
+    def _detect(self, listed_codec, probe_returncode=0):
+        """Run detect_hw_encoder (uncached) against a fake ffmpeg; return (result, probe commands)."""
+        probes = []
+
+        def fake_run(cmd, **kwargs):
+            if '-encoders' in cmd:
+                return types.SimpleNamespace(returncode=0, stdout=f" V....D {listed_codec}   test encoder\n")
+            probes.append(cmd)
+            return types.SimpleNamespace(returncode=probe_returncode, stdout=b'', stderr=b'')
+
+        with mock.patch.object(media_utils.subprocess, 'run', side_effect=fake_run):
+            result = media_utils.detect_hw_encoder.__wrapped__()
+        return result, probes
+
+    def test_probe_uses_the_real_encode_arguments(self):
+        for opts in media_utils.FFMPEG_HW_ENCODING_OPTS:
+            with self.subTest(codec=opts['video_codec']):
+                result, probes = self._detect(opts['video_codec'])
+                self.assertIs(result, opts)
+                self.assertEqual(len(probes), 1)
+                codec_args = media_utils._video_codec_args(opts)
+                cmd = probes[0]
+                start = cmd.index('-c:v')
+                self.assertEqual(cmd[start:start + len(codec_args)], codec_args)
+
+    def test_rejected_encoder_is_not_selected(self):
+        result, probes = self._detect('h264_videotoolbox', probe_returncode=1)
+        self.assertIsNone(result)
+        self.assertEqual(len(probes), 1)
+
+    def test_unlisted_encoders_are_not_probed(self):
+        result, probes = self._detect('libx264')
+        self.assertIsNone(result)
+        self.assertEqual(probes, [])
+
+
+class RawvideoEncodeTests(unittest.TestCase):
+
+    # Stands in for ffmpeg: writes far more than a pipe buffer of errors to
+    # stderr before reading any frames, then fails
+    CHATTY_ENCODER = (
+        "import sys\n"
+        "for i in range(5000):\n"
+        "    sys.stderr.write(f'error {i}: something went wrong\\n')\n"
+        "sys.stderr.flush()\n"
+        "sys.stdin.buffer.read()\n"
+        "sys.exit(1)\n"
+    )
+
+    def _start(self):
+        popen = subprocess.Popen
+
+        def fake_popen(cmd, **kwargs):
+            return popen([sys.executable, '-c', self.CHATTY_ENCODER], **kwargs)
+
+        with mock.patch.object(media_utils, 'require_ffmpeg'), \
+                mock.patch.object(media_utils.subprocess, 'Popen', side_effect=fake_popen):
+            return media_utils.start_ffmpeg_rawvideo_encode('out.mp4', 16, 16, 30, include_audio=False)
+
+    def test_stderr_is_drained_while_frames_are_written(self):
+        proc = self._start()
+        self.addCleanup(proc.kill)
+        frame = bytes(16 * 16 * 3)
+        for _ in range(200):
+            proc.stdin.write(frame)
+
+        with self.assertRaises(subprocess.CalledProcessError) as ctx:
+            media_utils.finish_ffmpeg_encode(proc)
+        lines = ctx.exception.stderr.splitlines()
+        self.assertEqual(len(lines), 200)
+        self.assertEqual(lines[-1], 'error 4999: something went wrong')
+
+
+class EncodeSegmentsGraphTests(unittest.TestCase):
+
+    def _command(self, segments, **kwargs):
+        """Return the ffmpeg command run_ffmpeg_encode_segments would run."""
+        with mock.patch.object(media_utils, 'require_ffmpeg'), \
+                mock.patch.object(media_utils, '_run_ffmpeg') as run:
+            media_utils.run_ffmpeg_encode_segments('in.mp4', 'out.mp4', segments, **kwargs)
+        return run.call_args[0][0]
+
+    def _graph(self, cmd):
+        return cmd[cmd.index('-filter_complex') + 1].split(';')
+
+    def test_segments_are_interleaved_for_concat(self):
+        cmd = self._command([(0, 1.5, 1.0), (3, None, 2.0)])
+        self.assertEqual(self._graph(cmd), [
+            '[0:v]trim=start=0:end=1.5,setpts=(PTS-STARTPTS)/1.0[v0]',
+            '[0:a]atrim=start=0:end=1.5,asetpts=PTS-STARTPTS[a0]',
+            '[0:v]trim=start=3,setpts=(PTS-STARTPTS)/2.0[v1]',
+            '[0:a]atrim=start=3,asetpts=PTS-STARTPTS,atempo=2.0[a1]',
+            '[v0][a0][v1][a1]concat=n=2:v=1:a=1[cv][out_a]',
+            '[cv]null[out_v]',
+        ])
+        self.assertEqual(cmd[cmd.index('[out_v]') + 1:cmd.index('[out_v]') + 3], ['-map', '[out_a]'])
+
+    def test_atempo_is_chained_outside_its_range(self):
+        cases = [
+            (5.0, 'atempo=2.0,atempo=2.0,atempo=1.25'),
+            (0.2, 'atempo=0.5,atempo=0.5,atempo=0.8'),
+        ]
+        for speed, chain in cases:
+            with self.subTest(speed=speed):
+                graph = self._graph(self._command([(0, None, speed)]))
+                self.assertEqual(graph[1], f'[0:a]atrim=start=0,asetpts=PTS-STARTPTS,{chain}[a0]')
+
+    def test_without_audio(self):
+        cmd = self._command([(0, 1, 1.0), (2, 3, 4.0)], include_audio=False, video_filter='scale=320:-2')
+        graph = self._graph(cmd)
+        self.assertFalse(any('[0:a]' in part for part in graph))
+        self.assertEqual(graph[-2:], ['[v0][v1]concat=n=2:v=1:a=0[cv]', '[cv]scale=320:-2[out_v]'])
+        self.assertIn('-an', cmd)
+        self.assertNotIn('[out_a]', cmd)
+
+    @unittest.skipUnless(shutil.which('ffmpeg'), "ffmpeg is required")
+    def test_two_segment_encode(self):
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        source, output = tmp / "in.mp4", tmp / "out.mp4"
+        subprocess.run([
+            'ffmpeg', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'testsrc=size=64x48:rate=10:duration=2',
+            '-f', 'lavfi', '-i', 'sine=duration=2',
+            '-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-c:a', 'aac', str(source)
+        ], check=True)
+
+        # 0.5 s at normal speed + 1 s at double speed
+        media_utils.run_ffmpeg_encode_segments(str(source), str(output), [(0, 0.5, 1.0), (1.0, None, 2.0)])
+
+        cap = cv2.VideoCapture(str(output))
+        duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / cap.get(cv2.CAP_PROP_FPS)
+        cap.release()
+        self.assertAlmostEqual(duration, 1.0, delta=0.15)
+
+
+class CoordinateArrayTests(unittest.TestCase):
+    """The array coordinate helpers must agree with the scalar ones point by point."""
+
+    OFFSET = (37, -12)
+    IMAGE_SIZE = (640, 360)
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # Well outside the image on every side, including negative points
+        self.points = np.concatenate([
+            rng.integers(-500, 1500, (500, 2)),
+            [[0, 0], [-1, -1], [37, -12], [1e4, 1e4], [-1e4, 5]],
+        ])
+
+    def test_canvas_to_image(self):
+        for scale in (0.37, 1.0, 2.5):
+            for points in (self.points, self.points + 0.5):
+                with self.subTest(scale=scale, dtype=points.dtype):
+                    actual = media_utils.canvas_to_image_coords_np(points, self.OFFSET, scale, self.IMAGE_SIZE)
+                    expected = [media_utils.canvas_to_image_coords(x, y, self.OFFSET, scale, self.IMAGE_SIZE)
+                                for x, y in points]
+                    self.assertEqual(actual.dtype, np.int32)
+                    np.testing.assert_array_equal(actual, expected)
+
+    def test_image_to_canvas(self):
+        for scale in (0.37, 1.0, 2.5):
+            for points in (self.points, self.points + 0.5):
+                with self.subTest(scale=scale, dtype=points.dtype):
+                    actual = media_utils.image_to_canvas_coords_np(points, self.OFFSET, scale)
+                    expected = [media_utils.image_to_canvas_coords(x, y, self.OFFSET, scale)
+                                for x, y in points]
+                    self.assertEqual(actual.dtype, np.int32)
+                    np.testing.assert_array_equal(actual, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
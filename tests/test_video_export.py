@@ -0,0 +1,122 @@
+"""
+Tests for the GUI video export pipeline (MediaProcessorGUI._process_video_file).
+
+The export is driven without a Tk window: the GUI object is created without
+running __init__, and only the settings the export reads are set on it.
+"""
+
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import image_processor_gui  # noqa: E402
+import media_utils  # noqa: E402
+from image_processor_gui import MediaProcessorGUI  # noqa: E402
+
+
+def _var(value):
+    """Stand-in for a Tk variable."""
+    return types.SimpleNamespace(get=lambda: value)
+
+
+class SlowCapture:
+    """Wraps a VideoCapture so every read takes `delay` seconds."""
+
+    def __init__(self, cap, delay):
+        self._cap = cap
+        self._delay = delay
+
+    def read(self):
+        time.sleep(self._delay)
+        return self._cap.read()
+
+    def __getattr__(self, name):
+        return getattr(self._cap, name)
+
+
+@unittest.skipUnless(shutil.which('ffmpeg'), "ffmpeg is required")
+class VideoExportTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+        self.video_path = Path(self.tmp) / "clip.avi"
+        writer = cv2.VideoWriter(str(self.video_path), cv2.VideoWriter_fourcc(*'MJPG'), 30, (320, 240))
+        for i in range(60):
+            writer.write(np.full((240, 320, 3), i * 4, dtype=np.uint8))
+        writer.release()
+
+        self.out_dir = Path(self.tmp) / "out"
+        self.out_dir.mkdir()
+        self.gui = MediaProcessorGUI.__new__(MediaProcessorGUI)
+        self.gui._get_target_dimensions = lambda: (320, 180)
+        self.gui.blur_radius = _var(10)
+        self.gui.video_speed = _var(1.0)
+        self.gui.replace_original = _var(False)
+        self.gui.output_folder = _var(str(self.out_dir))
+        self.gui.include_audio = _var(False)
+        self.gui.hw_encode = _var(False)
+        self.gui.cancel_event = threading.Event()
+
+    def _run_export(self, timeout):
+        """Run the export in a thread; return (finished, result or exception)."""
+        outcome = {}
+
+        def run():
+            try:
+                outcome['result'] = self.gui._process_video_file(self.video_path, None, None)
+            except Exception as e:
+                outcome['result'] = e
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        return not thread.is_alive(), outcome.get('result')
+
+    def test_export_writes_output(self):
+        finished, result = self._run_export(timeout=60)
+        self.assertTrue(finished)
+        self.assertIs(result, True)
+        self.assertTrue((self.out_dir / "clip_processed.mp4").exists())
+
+    def test_failed_hw_encode_falls_back_to_software(self):
+        # A "hardware" encoder that passed detection but fails on the real encode
+        broken = dict(media_utils.FFMPEG_ENCODING_OPTS, video_codec='no_such_encoder')
+        for module in (image_processor_gui, media_utils):
+            self.addCleanup(setattr, module, 'detect_hw_encoder', module.detect_hw_encoder)
+            module.detect_hw_encoder = lambda: broken
+        self.gui.hw_encode = _var(True)
+
+        finished, result = self._run_export(timeout=60)
+        self.assertTrue(finished)
+        self.assertIs(result, True)
+        self.assertTrue((self.out_dir / "clip_processed.mp4").exists())
+
+    def test_cancel_while_reader_is_slow(self):
+        # The reader is much slower than the worker pool, so the submit loop
+        # is waiting on an empty read queue when the cancel arrives
+        open_capture = image_processor_gui.open_video_capture
+        image_processor_gui.open_video_capture = lambda path: SlowCapture(open_capture(path), 0.2)
+        self.addCleanup(setattr, image_processor_gui, 'open_video_capture', open_capture)
+
+        threading.Timer(0.5, self.gui.cancel_event.set).start()
+        finished, result = self._run_export(timeout=10)
+
+        self.assertTrue(finished, "export did not stop after cancel")
+        self.assertIsInstance(result, InterruptedError)
+        self.assertFalse((self.out_dir / "clip_processed.mp4").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()